@@ -33,9 +33,9 @@ module chip (
 		.RGB1     (LED_G),
 		.RGB2     (LED_B)
 	);
-	defparam RGB_DRIVER.CURRENT_MODE = "0b1";
-	defparam RGB_DRIVER.RGB0_CURRENT = "0b000001";
-	defparam RGB_DRIVER.RGB1_CURRENT = "0b000001";
-	defparam RGB_DRIVER.RGB2_CURRENT = "0b000001";
+	defparam rgb.CURRENT_MODE = "0b1";
+	defparam rgb.RGB0_CURRENT = "0b000001";
+	defparam rgb.RGB1_CURRENT = "0b000001";
+	defparam rgb.RGB2_CURRENT = "0b000001";
 
 endmodule
@@ -15,7 +15,8 @@ from math import log2
 from myhdl import always, block, Signal, intbv, Error, ResetSignal, \
     enum, always_comb, concat, ConcatSignal, modbv, instances
 
-IDLE, WRITE, READ, STARTC, STARTD = range(5)
+IDLE, WRITE, READ, STARTC, STARTD, NEXTC, NEXTD, SWITCH = range(8)
+RAWD = 8  # Needs a 4 bit i_mode
 
 # Trade speed and functionality (DYNAMIC trees) for LUTs
 LOWLUT = True
@@ -40,59 +41,162 @@ FAST = True
 ONEBLOCK = True
 ONEBLOCK = False
 
-if LOWLUT:
-    if COMPRESS:
-        raise Error("compress cannot be combined with LOWLUT")
-    DYNAMIC = False
-    MATCH10 = False
-    FAST = False
-    ONEBLOCK = True
+# Compress from a registered (BRAM) input buffer with a pipelined search,
+# for devices without LUT-RAM
+CBRAM = False
 
-if not COMPRESS:
-    MATCH10 = False
-    FAST = False
+# Window slots compared in each cycle by the non FAST search
+SLOTS = 1
 
-# Search window for compression
-if FAST or LOWLUT:
-    CWINDOW = 32
-else:
-    CWINDOW = 256
+# Search window of the compressor (CWINDOW), any size from 32 to 32768
+# bytes. 0 is 32 with FAST or LOWLUT, else 256.
+WINDOW = 0
+
+# Register the FAST match selection and extension to close timing
+FASTPIPE = False
 
 OBSIZE = 32768  # Size of output buffer for ANY input (BRAM)
 OBSIZE = 512    # Minimal size of output buffer (BRAM)
 
-# Size of input buffer (LUT-RAM)
-if FAST:
-    IBSIZE = 16 * CWINDOW  # This size gives dynamic tree for testbench
-else:
-    IBSIZE = 2 * CWINDOW   # Minimal window
+# Size of the progress and address counters, they wrap around. 0 is 24
+# bits, 16 with LOWLUT.
+PROGRESSBITS = 0
 
-print("IBSIZE", IBSIZE)
+# Size of the optional total byte counters
+TOTALBITS = 48
 
-# Size of progress and I/O counters
-if LOWLUT:
-    LMAX = 16
-else:
-    LMAX = 24
+# Size of the optional performance and statistics counters, see o_pdata
+PERFBITS = 32
 
-# =============== End of user settable parameters ==================
+# Number of stream contexts (power of 2), see SWITCH. Each context has its
+# own buffers and trees on the chip, about 684 Kbit with DYNAMIC decompress.
+NCONTEXT = 1
+
+# Speculative RAWD decompress with an unknown window, see o_entry
+SPECULATE = False
 
-if OBSIZE > IBSIZE:
-    LBSIZE = int(log2(OBSIZE))
-else:
-    LBSIZE = int(log2(IBSIZE))
+# Copy distances beyond OBSIZE from an external memory, see o_hreq
+XHISTORY = False
 
-LIBSIZE = int(log2(IBSIZE))
-LOBSIZE = int(log2(OBSIZE))
+# Put leaves, d_leaves and the XHISTORY window in iCE40 UltraPlus SPRAM
+SPRAM = False
 
-IBS = (1 << LIBSIZE) - 1
-OBS = (1 << LOBSIZE) - 1
+# =============== End of user settable parameters ==================
+
+FLAGS = ('LOWLUT', 'COMPRESS', 'DECOMPRESS', 'DYNAMIC', 'MATCH10', 'FAST',
+         'ONEBLOCK', 'CBRAM', 'SLOTS', 'WINDOW', 'FASTPIPE', 'OBSIZE',
+         'PROGRESSBITS', 'TOTALBITS', 'PERFBITS', 'NCONTEXT', 'SPECULATE',
+         'XHISTORY', 'SPRAM')
+
+SPRAM_WORDS = 16384  # 16 bit words of an SB_SPRAM256KA
 
 d_state = enum('IDLE', 'HEADER', 'BL', 'READBL', 'REPEAT', 'DISTTREE', 'INIT3',
                'HF1', 'HF1INIT', 'HF2', 'HF3', 'HF4', 'HF4_2', 'HF4_3',
-               'STATIC', 'D_NEXT', 'D_NEXT_2', 'D_INFLATE', 'SPREAD', 'NEXT',
+               'D_NEXT', 'D_NEXT_2', 'D_INFLATE', 'SPREAD', 'NEXT',
                'INFLATE', 'COPY', 'CSTATIC', 'SEARCH', 'SEARCH10', 'SEARCHF',
-               'DISTANCE', 'CHECKSUM')  # , encoding='one_hot')
+               'DISTANCE', 'CHECKSUM', 'RESTORE', 'PRESET')  # , encoding='one_hot')
+
+# Performance counters: cycles in each d_state, then the stall reasons
+PC_HOLDB = len(d_state._names)  # the output ring is full
+PC_HOLDW = PC_HOLDB + 1         # a copy waits for room in the output ring
+PC_INPUT = PC_HOLDB + 2         # waiting for input
+NPERF = PC_HOLDB + 3
+
+# Compress statistics, see o_sdata
+ST_LITERALS = 0           # literals
+ST_MATCHES = 1            # matches
+ST_MBYTES = 2             # bytes in matches
+ST_LENGTH = 3             # matches of length 3 + k at ST_LENGTH + k
+ST_DIST = ST_LENGTH + 8   # matches with 2**(k-1) < distance <= 2**k
+
+
+def configure(**flags):
+
+    """ Set user parameters (see FLAGS) and derive the other settings
+
+    Returns the previous value of each user parameter, so configure(**saved)
+    restores them. Modules that depend on a derived size like CWINDOW or
+    IBSIZE read it from this module when they build a block.
+
+    """
+
+    global LOWLUT, DYNAMIC, MATCH10, FAST, ONEBLOCK, CWINDOW, IBSIZE, \
+        LMAX, LBSIZE, LIBSIZE, LOBSIZE, IBS, OBS, LMASK, NSTATS
+
+    saved = {k: globals()[k] for k in FLAGS}
+    for k, v in flags.items():
+        if k not in FLAGS:
+            raise Error("%s is not a user parameter" % k)
+        globals()[k] = v
+
+    if LOWLUT:
+        if COMPRESS:
+            raise Error("compress cannot be combined with LOWLUT")
+        DYNAMIC = False
+        MATCH10 = False
+        FAST = False
+        ONEBLOCK = True
+
+    if CBRAM:
+        if DECOMPRESS:
+            raise Error("CBRAM is a compress only variant")
+        FAST = False
+
+    if not COMPRESS:
+        MATCH10 = False
+        FAST = False
+
+    # Search window for compression
+    if WINDOW:
+        CWINDOW = WINDOW
+    elif FAST or LOWLUT:
+        CWINDOW = 32
+    else:
+        CWINDOW = 256
+    if not 32 <= CWINDOW <= 32768:
+        raise Error("the search window must be 32 to 32768 bytes")
+
+    # Size of input buffer (LUT-RAM), rounded up to a power of 2
+    if FAST:
+        IBSIZE = 16 * CWINDOW  # This size gives dynamic tree for testbench
+    else:
+        IBSIZE = 2 * CWINDOW   # Minimal window
+    IBSIZE = 1 << (IBSIZE - 1).bit_length()
+
+    if OBSIZE > IBSIZE:
+        LBSIZE = int(log2(OBSIZE))
+    else:
+        LBSIZE = int(log2(IBSIZE))
+
+    # Size of progress and I/O counters, they wrap around
+    if PROGRESSBITS:
+        LMAX = PROGRESSBITS
+    elif LOWLUT:
+        LMAX = 16
+    else:
+        LMAX = 24
+    if LMAX <= LBSIZE:
+        raise Error("the progress counters must be wider than the buffers")
+
+    LIBSIZE = int(log2(IBSIZE))
+    LOBSIZE = int(log2(OBSIZE))
+
+    IBS = (1 << LIBSIZE) - 1
+    OBS = (1 << LOBSIZE) - 1
+    LMASK = (1 << LMAX) - 1
+
+    NSTATS = ST_DIST + len(bin(CWINDOW - 1)) - 1
+
+    return saved
+
+
+configure()
+
+print("IBSIZE", IBSIZE)
+
+# Trace events, see deflate_trace
+t_event = enum('NONE', 'START', 'END', 'HEADER', 'TREE', 'EOB', 'CHECKPOINT',
+               'CACHE_MISS', 'DCACHE_MISS', 'HOLDB', 'INPUT', 'STATE')
 
 CodeLengthOrder = (16, 17, 18, 0, 8, 7, 9, 6, 10, 5, 11, 4, 12, 3, 13, 2, 14,
                    1, 15)
@@ -216,34 +320,347 @@ stat_leaves = (
 )
 
 
+@block
+def spram(addr, din, mask, we, dout, clk):
+
+    """ iCE40 UltraPlus SB_SPRAM256KA, 16K x 16 bit single port RAM
+
+    Ports:
+
+    addr: word address
+    din: data to write
+    mask: write enable of each nibble of din
+    we: write din to addr, else read addr into dout in the next cycle
+
+    """
+
+    mem = [Signal(intbv(0)[16:]) for _ in range(SPRAM_WORDS)]
+
+    @always(clk.posedge)
+    def logic():
+        if we:
+            w = int(mem[addr])
+            for n in range(4):
+                if mask & (1 << n):
+                    w = (w & ~(0xF << 4 * n)) | (din & (0xF << 4 * n))
+            mem[addr].next = w
+        else:
+            dout.next = mem[addr]
+
+    addr.read = din.read = mask.read = we.read = True
+    dout.driven = "wire"
+
+    spram.verilog_code = """
+SB_SPRAM256KA ${dout}_spram (
+    .ADDRESS($addr),
+    .DATAIN($din),
+    .MASKWREN($mask),
+    .WREN($we),
+    .CHIPSELECT(1'b1),
+    .CLOCK($clk),
+    .STANDBY(1'b0),
+    .SLEEP(1'b0),
+    .POWEROFF(1'b1),
+    .DATAOUT($dout)
+);
+"""
+
+    return logic
+
+
+@block
+def ppair(o_found, o_first, l_found, r_found):
+
+    """ Leaf node of the priority tree """
+
+    @always_comb
+    def logic():
+        o_found.next = l_found or r_found
+        o_first.next = not l_found
+
+    return logic
+
+
+@block
+def pmerge(o_found, o_first, l_found, l_first, r_found, r_first, half):
+
+    """ Node of the priority tree, the left half has priority """
+
+    @always_comb
+    def logic():
+        o_found.next = l_found or r_found
+        if l_found:
+            o_first.next = l_first
+        else:
+            o_first.next = half + r_first
+
+    return logic
+
+
+@block
+def ptree(o_found, o_first, match):
+
+    """ Priority tree, o_first is the lowest index with match set """
+
+    n = len(match)
+    if n == 2:
+        return ppair(o_found, o_first, match[0], match[1])
+    l_found = Signal(bool())
+    r_found = Signal(bool())
+    l_first = Signal(intbv(0, min=0, max=n // 2))
+    r_first = Signal(intbv(0, min=0, max=n // 2))
+    left = ptree(l_found, l_first, match[:n // 2])
+    right = ptree(r_found, r_first, match[n // 2:])
+    node = pmerge(o_found, o_first, l_found, l_first, r_found, r_first,
+                  n // 2)
+    return left, right, node
+
+
 @block
 def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
-            i_waddr, i_raddr, clk, reset):
+            i_waddr, i_raddr, clk, reset, i_we=None, i_re=None,
+            o_itotal=None, o_ototal=None, o_ctx=None, i_stop=None,
+            o_entry=None, i_cpoint=None, o_cpoint=None, o_cpin=None,
+            o_cpout=None, o_hreq=None, o_haddr=None, i_hdata=None,
+            i_hack=None, i_paddr=None, o_pdata=None, i_saddr=None,
+            o_sdata=None, o_fail=None, o_wait=None, tracer=None):
 
     """ Deflate (de)compress
 
     Ports:
 
+    i_we: write i_data to i_waddr, independent of i_mode
+    i_re: read o_byte from i_raddr, independent of i_mode
+    o_itotal: input bytes consumed by the current job, TOTALBITS wide
+    o_ototal: output bytes produced by the current job, TOTALBITS wide
+    o_ctx: the active context
+    i_stop: bit address (byte << 3 | bit) of a block to stop at, 0 is none
+    o_entry: output entry with the mark of a speculative decode
+    o_fail: a speculative decode met invalid data, set with o_done
+    o_wait: the job needs more input than the host has written
+    i_cpoint: compress input bytes between checkpoints, 0 is none
+    o_cpoint: pulse when the compressor emits a checkpoint
+    o_cpin: input address of the last checkpoint
+    o_cpout: output bit address (byte << 3) of the last checkpoint
+    o_hreq: request the history byte at o_haddr from the external memory
+    o_haddr: output address of the requested history byte
+    i_hdata: the requested history byte
+    i_hack: i_hdata is valid, high for a single cycle per byte
+    i_paddr: performance counter to read
+    o_pdata: value of performance counter i_paddr in the previous cycle
+    i_saddr: compress statistic to read
+    o_sdata: value of statistic i_saddr in the previous cycle
+    tracer: a deflate_trace.Tracer to record events in simulation
+
+    With i_we and i_re a host can feed input and drain output in the same
+    cycle. Keep i_mode at READ while streaming and set it to IDLE after the
+    last input byte. The WRITE and READ modes still work as before. When a
+    decompress job ends at its final block, o_iprogress is the byte after the
+    block, where the checksum of a zlib stream starts.
+
+    NEXTC and NEXTD queue the next job while the current one runs, its input
+    starts at i_waddr. The queued job ends the input of the current job and
+    its output follows the output of the current job. o_done is then high
+    for a single cycle, with o_oprogress at the end of the finished job.
+
+    The addresses and the progress counters are LMAX bits and wrap around,
+    so a stream can be longer than 1 << LMAX bytes.
+
+    With NCONTEXT > 1 the core keeps that many streams, each with its own
+    buffers, trees and registers. SWITCH parks the active stream and resumes
+    context i_data. It is taken when the core is idle or a decompress stream
+    waits for input, so hold SWITCH until o_ctx shows the new context and
+    keep i_raddr at the next byte of the new context. Do not write input
+    while switching.
+
+    RAWD decompresses raw deflate blocks from address i_waddr, bit i_data[3:].
+    i_stop ends a decompress job at the header of a later block.
+    With SPECULATE the window before the first block may be unknown, an
+    output entry that depends on this window is marked with bit LOBSIZE and
+    holds the ring address of its byte. When a speculative decode runs into
+    invalid data or out of input, its start was not a block header: the job
+    ends with o_done and o_fail instead of stopping the simulation.
+
+    With i_cpoint the compressor does a full flush (an empty stored block)
+    each time i_cpoint input bytes have been compressed and matches do not
+    reach back before it. The blocks are not final, the stream ends with an
+    empty final block. Each checkpoint is reported with o_cpin and o_cpout,
+    RAWD starts there and i_stop at the next checkpoint ends the slice.
+    Keep i_cpoint stable during a job.
+
+    With XHISTORY a copy from further back than OBSIZE bytes reads the
+    external memory, so OBSIZE can be small for streams with a 32 KB window.
+    The host keeps all output before i_raddr in this memory, oram caches
+    the last OBSIZE bytes. Each fetched byte costs at least 2 cycles.
+
+    SPRAM maps leaves (2 blocks) and d_leaves on SB_SPRAM256KA blocks, with
+    XHISTORY the 32 KB window is the 4th block. It is written with the output
+    bytes the host reads, so read the output in order, and the history ports
+    are not used. oram stays a small dual port ring, SPRAM has a single port.
+
+    Without FAST the search compares SLOTS window slots in each cycle and
+    takes the nearest match, the output does not depend on SLOTS.
+
+    FASTPIPE registers the FAST match selection and the match extension
+    compares, the output does not change.
+
+    With o_pdata the core counts the cycles of a job in each d_state (at
+    index int(d_state.X)) and the stall cycles at PC_HOLDB, PC_HOLDW and
+    PC_INPUT. The counters restart with each job.
+
+    With o_sdata a compress job counts its literals, matches and matched
+    bytes and the matches per length and per distance range, see ST_LITERALS
+    etc. They hold their value after o_done until the next job starts.
+
+    A tracer records the t_event events of the core (and cannot be converted).
+    Without one the trace process is not built and tevent is never set, so
+    it is removed in synthesis.
+
     """
 
-    iram = [Signal(intbv()[8:]) for _ in range(IBSIZE)]
-    oram = [Signal(intbv()[8:]) for _ in range(OBSIZE)]
+    if NCONTEXT & (NCONTEXT - 1):
+        raise Error("NCONTEXT must be a power of 2")
+    if LOWLUT and NCONTEXT > 1:
+        raise Error("contexts cannot be combined with LOWLUT")
+    if CBRAM and (DECOMPRESS or FAST):
+        raise Error("CBRAM is a compress only variant without FAST")
+    if SLOTS > 1 and CBRAM:
+        raise Error("CBRAM has a single search port")
+    if FASTPIPE and (not FAST or CWINDOW & (CWINDOW - 1)):
+        raise Error("FASTPIPE needs FAST and a power of 2 CWINDOW")
+
+    # The input buffer is read through a registered port
+    CBMODE = CBRAM
+    RBUF = LOWLUT or CBMODE
+    # A streamed INFLATE waits while iavail <= IWAIT, without RBUF b4 is
+    # refetched while a decompress job streams and 2 bytes are enough
+    IWAIT = 4 if RBUF else 2
+    if MATCH10:
+        RMAX = 10
+    else:
+        RMAX = 5
+    # Slots compared in each cycle by the non FAST search
+    NSLOTS = SLOTS
+    FPIPE = FASTPIPE
+    CONTEXTS = NCONTEXT > 1
+    CMASK = NCONTEXT - 1
+
+    XMODE = XHISTORY
+    SPMODE = SPRAM
+    if SPMODE and (CONTEXTS or not DYNAMIC or not DECOMPRESS):
+        raise Error("SPRAM needs DYNAMIC decompress and a single context")
+
+    # Output entries are bytes or marked ring addresses
+    RAWMODE = SPECULATE
+    if RAWMODE:
+        OWIDTH = LOBSIZE + 1
+        MARK = 1 << LOBSIZE
+    else:
+        OWIDTH = 8
+        MARK = 0
+
+    # Without a read enable port o_byte follows i_raddr on every cycle
+    READ_ALWAYS = i_re is None
+    if i_we is None:
+        i_we = Signal(bool(0))
+    if i_re is None:
+        i_re = Signal(bool(0))
+    if o_itotal is None:
+        o_itotal = Signal(modbv(0)[TOTALBITS:])
+    if o_ototal is None:
+        o_ototal = Signal(modbv(0)[TOTALBITS:])
+    if o_ctx is None:
+        o_ctx = Signal(intbv(0)[8:])
+    if i_stop is None:
+        i_stop = Signal(intbv(0)[LMAX + 3:])
+    if o_entry is None:
+        o_entry = Signal(intbv(0)[OWIDTH:])
+    if o_fail is None:
+        o_fail = Signal(bool(0))
+    if o_wait is None:
+        o_wait = Signal(bool(0))
+    if i_cpoint is None:
+        i_cpoint = Signal(intbv(0)[LMAX:])
+    if o_cpoint is None:
+        o_cpoint = Signal(bool(0))
+    if o_cpin is None:
+        o_cpin = Signal(modbv(0)[LMAX:])
+    if o_cpout is None:
+        o_cpout = Signal(modbv(0)[LMAX + 3:])
+    if o_hreq is None:
+        o_hreq = Signal(bool(0))
+    if o_haddr is None:
+        o_haddr = Signal(modbv(0)[LMAX:])
+    if i_hdata is None:
+        i_hdata = Signal(intbv(0)[8:])
+    if i_hack is None or (SPMODE and XMODE):
+        i_hack = Signal(bool(0))
+    if SPMODE and XMODE:
+        i_hdata = Signal(intbv(0)[8:])
+    PERF = o_pdata is not None
+    if i_paddr is None:
+        i_paddr = Signal(intbv(0, min=0, max=NPERF))
+    STATS = o_sdata is not None
+    TRACING = tracer is not None
+    if i_saddr is None:
+        i_saddr = Signal(intbv(0, min=0, max=NSTATS))
+
+    # Each context has its own part of the buffers and trees
+    iram = [Signal(intbv()[8:]) for _ in range(IBSIZE * NCONTEXT)]
+    oram = [Signal(intbv()[OWIDTH:]) for _ in range(OBSIZE * NCONTEXT)]
 
     oaddr = Signal(modbv()[LOBSIZE:])
     oraddr = Signal(modbv()[LOBSIZE:])
-    obyte = Signal(intbv()[8:])
-    orbyte = Signal(intbv()[8:])
+    obyte = Signal(intbv()[OWIDTH:])
+    orbyte = Signal(intbv()[OWIDTH:])
     irbyte = Signal(intbv()[8:])
 
     # iraddr = Signal(modbv()[LIBSIZE:])
 
-    isize = Signal(intbv()[LMAX:])
+    isize = Signal(modbv()[LMAX:])
     state = Signal(d_state.IDLE)
+    # Event for the tracer, only set with one but MyHDL needs the signal
+    tevent = Signal(t_event.NONE)
+    # Stall reason (PC_HOLDB etc.) of the previous cycle, 0 for none
+    stall = Signal(intbv(0, min=0, max=NPERF))
+
+    # Start of the input and output of the running job
+    ibase = Signal(modbv()[LMAX:])
+    obase = Signal(modbv()[LMAX:])
+    jstart = Signal(bool())
+
+    # Queued job
+    pend = Signal(bool())
+    pend_c = Signal(bool())
+    pend_base = Signal(modbv()[LMAX:])
+
+    # Input of the running job after di and more input expected
+    iavail = Signal(modbv(0, min=-(1 << (LMAX - 1)), max=1 << (LMAX - 1)))
+    streaming = Signal(bool())
+
+    # Distances between the wrapping counters
+    ifill = Signal(modbv(0, min=-(1 << (LMAX - 1)), max=1 << (LMAX - 1)))
+    # The job has had its first 4 input bytes, ifill wraps in long jobs
+    ifilled = Signal(bool())
+    oahead = Signal(modbv(0, min=-(1 << (LMAX - 1)), max=1 << (LMAX - 1)))
+    ipos = Signal(modbv()[LMAX:])
+    cbase = Signal(modbv()[LMAX:])  # Input address of the last checkpoint
+    opos = Signal(modbv()[LMAX:])
+    # ipos and opos wrap, once they reached a window they stay there
+    OREACH = min(32768, 1 << (LMAX - 1))
+    iwide = Signal(bool())
+    owide = Signal(bool())
+    ireach = Signal(intbv(0, min=0, max=CWINDOW + 1))
+    oreach = Signal(intbv(0, min=0, max=OREACH + 1))
+    sdist = Signal(modbv()[LMAX:])
+
+    iprev = Signal(modbv()[LMAX:])
+    oprev = Signal(modbv()[LMAX:])
     method = Signal(intbv()[3:])
-    prev_method = Signal(intbv()[2:])
     final = Signal(bool())
 
     do_compress = Signal(bool())
+    spec = Signal(bool())
 
     numLiterals = Signal(intbv()[9:])
     numDistance = Signal(intbv()[6:])
@@ -272,12 +689,16 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
     reverse = Signal(modbv()[CODEBITS:])
     distanceLength = [Signal(intbv()[4:]) for _ in range(32)]
 
-    if DECOMPRESS:
+    # Tree sizes of a context
+    NLEAVES = 32768
+    NDLEAVES = 4096
+
+    if DECOMPRESS and not SPMODE:
         if DYNAMIC:
             leaves = [Signal(intbv()[CODEBITS + BITBITS:])
-                      for _ in range(32768)]
+                      for _ in range(NLEAVES * NCONTEXT)]
             d_leaves = [Signal(intbv()[CODEBITS + BITBITS:])
-                        for _ in range(4096)]
+                        for _ in range(NDLEAVES * NCONTEXT)]
         else:
             leaves = [Signal(bool())]
             d_leaves = [Signal(bool())]
@@ -296,6 +717,10 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
     drleaf = Signal(intbv()[CODEBITS + BITBITS:])
     dwleaf = Signal(intbv()[CODEBITS + BITBITS:])
 
+    # Leaf writes, SPRAM can not read in the same cycle
+    lwe = Signal(bool())
+    dlwe = Signal(bool())
+
     leaf = Signal(intbv()[CODEBITS + BITBITS:])
 
     minBits = Signal(intbv()[4:])
@@ -314,13 +739,20 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
     lastToken = Signal(intbv()[9:])
     howOften = Signal(intbv()[9:])
 
-    cur_i = Signal(intbv()[LMAX:])
+    cur_i = Signal(modbv()[LMAX:])
     spread_i = Signal(intbv()[9:])
     cur_HF1 = Signal(intbv()[MaxCodeLength+1:])
-    cur_static = Signal(intbv()[9:])
-    cur_cstatic = Signal(intbv()[4:])
-    cur_search = Signal(intbv(min=-1, max=1 << LMAX))
+    cur_cstatic = Signal(intbv()[5:])
+    cur_search = Signal(modbv()[LMAX:])
     more = Signal(intbv()[4:])
+
+    # CBRAM search port, srbyte is read from sraddr in the previous cycle.
+    # sprime restarts the stream, sw1 and sw2 follow the search slot.
+    sraddr = Signal(modbv()[LMAX:])
+    srbyte = Signal(intbv()[8:])
+    sprime = Signal(bool())
+    sw1 = Signal(intbv()[8:])
+    sw2 = Signal(intbv()[8:])
     cur_dist = Signal(intbv(min=-CWINDOW, max=IBSIZE))
     cur_next = Signal(intbv()[5:])
 
@@ -330,13 +762,14 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
     mlength = Signal(modbv()[4:])
     dlength = Signal(modbv()[10:])
     offset = Signal(intbv()[LOBSIZE:])
+    far = Signal(bool())  # Copy from the external memory
     off1 = Signal(bool())
     off2 = Signal(bool())
 
     di = Signal(modbv()[LMAX:])
-    old_di = Signal(intbv()[LMAX:])
+    old_di = Signal(modbv()[LMAX:])
     dio = Signal(intbv()[3:])
-    do = Signal(intbv()[LMAX:])
+    do = Signal(modbv()[LMAX:])
     doo = Signal(intbv()[3:])
 
     b1 = Signal(intbv()[8:])
@@ -374,35 +807,225 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
     ob1 = Signal(intbv()[8:])
     outcarry = Signal(intbv()[9:])
     outcarrybits = Signal(intbv()[4:])
-    copy1 = Signal(intbv()[8:])
-    copy2 = Signal(intbv()[8:])
+    copy1 = Signal(intbv()[OWIDTH:])
+    copy2 = Signal(intbv()[OWIDTH:])
     flush = Signal(bool())
 
     adler1 = Signal(intbv()[16:])
     adler2 = Signal(intbv()[16:])
     ladler1 = Signal(intbv()[16:])
 
+    # Active context, its buffer and tree offsets and the switch request
+    ctx = Signal(intbv(0, min=0, max=max(NCONTEXT, 2)))
+    nctx = Signal(intbv(0, min=0, max=max(NCONTEXT, 2)))
+    swap = Signal(bool())
+    ibank = Signal(intbv(0, min=0, max=IBSIZE * NCONTEXT))
+    obank = Signal(intbv(0, min=0, max=OBSIZE * NCONTEXT))
+    lbank = Signal(intbv(0, min=0, max=NLEAVES * NCONTEXT))
+    dbank = Signal(intbv(0, min=0, max=NDLEAVES * NCONTEXT))
+    rcode = Signal(intbv(0)[2:])
+
+    def parked(s):
+        # Register s of every context
+        return [Signal(intbv(0)[len(s):]) for _ in range(NCONTEXT)]
+
+    c_state = [Signal(intbv(0)[2:]) for _ in range(NCONTEXT)]
+    c_di = parked(di)
+    c_dio = parked(dio)
+    c_do = parked(do)
+    c_doo = parked(doo)
+    c_method = parked(method)
+    c_final = parked(final)
+    c_static = parked(static)
+    c_maxBits = parked(maxBits)
+    c_instantMaxBit = parked(instantMaxBit)
+    c_d_maxBits = parked(d_maxBits)
+    c_d_instantMaxBit = parked(d_instantMaxBit)
+    c_code = parked(code)
+    c_cur_i = parked(cur_i)
+    c_length = parked(length)
+    c_ibase = parked(ibase)
+    c_obase = parked(obase)
+    c_owide = parked(owide)
+    c_iprogress = parked(o_iprogress)
+    c_oprogress = parked(o_oprogress)
+    c_done = parked(o_done)
+    c_oaddr = parked(oaddr)
+    c_obyte = parked(obyte)
+    c_lwaddr = parked(lwaddr)
+    c_wleaf = parked(wleaf)
+    c_dlwaddr = parked(dlwaddr)
+    c_dwleaf = parked(dwleaf)
+    c_isize = parked(isize)
+    c_ifilled = parked(ifilled)
+    c_itotal = parked(o_itotal)
+    c_ototal = parked(o_ototal)
+
+    @always_comb
+    def switching():
+        n = i_data & CMASK
+        nctx.next = n
+        swap.next = False
+        if i_mode == SWITCH and not pend and n != ctx:
+            if state == d_state.IDLE:
+                swap.next = True
+            elif state == d_state.INFLATE and iavail <= 4:
+                swap.next = True
+            elif state == d_state.COPY and method == 0 and iavail <= 2:
+                swap.next = True
+
+    @always_comb
+    def banks():
+        o_ctx.next = ctx
+        ibank.next = ctx * IBSIZE
+        obank.next = ctx * OBSIZE
+        lbank.next = ctx * NLEAVES
+        dbank.next = ctx * NDLEAVES
+
     @always(clk.posedge)
     def bramwrite():
-        oram[oaddr].next = obyte
-        if DYNAMIC:
-            leaves[lwaddr].next = wleaf
-            d_leaves[dlwaddr].next = dwleaf
+        oram[obank | oaddr].next = obyte
+        if DYNAMIC and not SPMODE:
+            leaves[lbank | lwaddr].next = wleaf
+            d_leaves[dbank | dlwaddr].next = dwleaf
 
     @always(clk.posedge)
     def bramread():
-        orbyte.next = oram[oraddr]
+        orbyte.next = oram[obank | oraddr]
 
-    if DYNAMIC:
+    if DYNAMIC and not SPMODE:
         @always(clk.posedge)
         def rleafread():
-            rleaf.next = leaves[lraddr]
-            drleaf.next = d_leaves[dlraddr]
+            rleaf.next = leaves[lbank | lraddr]
+            drleaf.next = d_leaves[dbank | dlraddr]
+
+    if SPMODE:
+        # A leaf fits in 16 bits, codes are less than 512
+        nibbles = Signal(intbv(0xF)[4:])
+        l_addr = Signal(intbv(0)[14:])
+        l_din = Signal(intbv(0)[16:])
+        l_we0 = Signal(bool(0))
+        l_we1 = Signal(bool(0))
+        l_dout0 = Signal(intbv(0)[16:])
+        l_dout1 = Signal(intbv(0)[16:])
+        l_sel = Signal(bool(0))
+        d_addr = Signal(intbv(0)[14:])
+        d_din = Signal(intbv(0)[16:])
+        d_dout = Signal(intbv(0)[16:])
+
+        sprams = [spram(l_addr, l_din, nibbles, l_we0, l_dout0, clk),
+                  spram(l_addr, l_din, nibbles, l_we1, l_dout1, clk),
+                  spram(d_addr, d_din, nibbles, dlwe, d_dout, clk)]
 
-    if LOWLUT:
+        @always_comb
+        def leafport():
+            nibbles.next = 0xF
+            l_din.next = wleaf[16:]
+            l_we0.next = lwe and not lwaddr[14]
+            l_we1.next = lwe and lwaddr[14]
+            if lwe:
+                l_addr.next = lwaddr[14:]
+            else:
+                l_addr.next = lraddr[14:]
+            d_din.next = dwleaf[16:]
+            if dlwe:
+                d_addr.next = dlwaddr[14:]
+            else:
+                d_addr.next = dlraddr[14:]
+
+        @always(clk.posedge)
+        def leafsel():
+            l_sel.next = lraddr[14]
+
+        @always_comb
+        def leafread():
+            if l_sel:
+                rleaf.next = l_dout1
+            else:
+                rleaf.next = l_dout0
+            drleaf.next = d_dout
+
+    if SPMODE and XMODE:
+        # The history window, written with the bytes the host reads
+        h_addr = Signal(intbv(0)[14:])
+        h_din = Signal(intbv(0)[16:])
+        h_mask = Signal(intbv(0)[4:])
+        h_we = Signal(bool(0))
+        h_dout = Signal(intbv(0)[16:])
+        h_rd = Signal(bool(0))
+        h_raddr = Signal(modbv(0)[LMAX:])
+        h_next = Signal(modbv(0)[LMAX:])
+        h_do = Signal(modbv(0)[LMAX:])
+        h_new = Signal(bool(0))
+        h_sel = Signal(bool(0))
+
+        hspram = spram(h_addr, h_din, h_mask, h_we, h_dout, clk)
+
+        @always_comb
+        def historynew():
+            # The next byte in order and it was written when it was read
+            h_new.next = h_rd and h_raddr == h_next and h_next != h_do
+
+        @always_comb
+        def historyport():
+            h_we.next = h_new and not jstart
+            h_din.next = concat(o_byte, o_byte)
+            if h_new:
+                h_addr.next = h_raddr[15:1]
+            else:
+                h_addr.next = o_haddr[15:1]
+            if h_raddr[0]:
+                h_mask.next = 0xC
+            else:
+                h_mask.next = 0x3
+            if h_sel:
+                i_hdata.next = h_dout[16:8]
+            else:
+                i_hdata.next = h_dout[8:]
+
+        @always(clk.posedge)
+        def history():
+            # o_byte is valid for h_raddr in the next cycle
+            h_rd.next = READ_ALWAYS or i_re or i_mode == READ
+            h_raddr.next = i_raddr
+            h_do.next = do
+            i_hack.next = False
+            if jstart:
+                h_next.next = obase
+            elif h_new:
+                h_next.next = h_next + 1
+            elif o_hreq and not i_hack:
+                i_hack.next = True
+                h_sel.next = o_haddr[0]
+
+    if RBUF:
         @always(clk.posedge)
         def iramread():
-            irbyte.next = iram[di + rcount & IBS]
+            irbyte.next = iram[ibank | di + rcount & IBS]
+
+    if CBMODE:
+        @always_comb
+        def sraddress():
+            if state == d_state.SEARCH10:
+                if sprime:
+                    sraddr.next = cur_search + more - 1
+                else:
+                    sraddr.next = cur_search + more
+            elif state == d_state.CHECKSUM:
+                if sprime:
+                    sraddr.next = cur_i
+                else:
+                    sraddr.next = cur_i + 1
+            else:
+                # The search runs down
+                if sprime:
+                    sraddr.next = cur_search
+                else:
+                    sraddr.next = cur_search - 1
+
+        @always(clk.posedge)
+        def sramread():
+            srbyte.next = iram[ibank | sraddr & IBS]
 
     @block
     def matcher3(o_m, mi):
@@ -420,27 +1043,203 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
         cwindow = Signal(bool())
         smatch = [Signal(bool())]
 
+    # FASTPIPE registers the selection for the window at pdi (c) and at
+    # pdi + 1 (n), so a SEARCH after a literal needs no extra cycle.
+    # ematch holds the compares of the match extension.
+    pdi = Signal(modbv()[LMAX:])
+    cfound = Signal(bool())
+    cfirst = Signal(intbv(0, min=0, max=CWINDOW))
+    nfound = Signal(bool())
+    nfirst = Signal(intbv(0, min=0, max=CWINDOW))
+    ematch = Signal(intbv(0)[RMAX - 3:])
+
+    @block
+    def nmatcher3(o_m, mi):
+        @always_comb
+        def logic():
+            o_m.next = (((concat(cwindow, b1, b2, b3) >> (8 * mi)) & 0xFFFFFF)
+                        == (b14 & 0xFFFFFF))
+        return logic
+
+    if FPIPE:
+        nmatch = [Signal(bool()) for _ in range(CWINDOW)]
+        nmatchers = [nmatcher3(nmatch[mi], mi) for mi in range(CWINDOW)]
+        tcfound = Signal(bool())
+        tcfirst = Signal(intbv(0, min=0, max=CWINDOW))
+        tnfound = Signal(bool())
+        tnfirst = Signal(intbv(0, min=0, max=CWINDOW))
+        ctree = ptree(tcfound, tcfirst, smatch)
+        ntree = ptree(tnfound, tnfirst, nmatch)
+
+        @always(clk.posedge)
+        def fastpipe():
+            pdi.next = old_di
+            cfound.next = tcfound
+            cfirst.next = tcfirst
+            nfound.next = tnfound
+            nfirst.next = tnfirst
+            fmatch2 = di - dlength + 2
+            if state == d_state.SEARCH:
+                if pdi == di:
+                    fmatch2 = di - cfirst + 2
+                else:
+                    fmatch2 = di - nfirst + 2
+            # Input against input, it does not wait for b5 .. b10
+            for k in range(RMAX - 3):
+                ematch.next[k] = iavail > 4 + k and \
+                    iram[ibank | fmatch2 + k & IBS] == \
+                    iram[ibank | di + 3 + k & IBS]
+
+    @always_comb
+    def input_end():
+        if pend:
+            iavail.next = pend_base - 1 - di
+            streaming.next = False
+        else:
+            iavail.next = isize - di
+            streaming.next = i_mode != IDLE
+
+    @always_comb
+    def distances():
+        ifill.next = isize - ibase
+        oahead.next = do - i_raddr
+        ipos.next = di - cbase
+        opos.next = do - obase
+        sdist.next = di - cur_search
+
+    @always_comb
+    def reaches():
+        # Input since the last checkpoint and output of the job, at most
+        # the window that a match or copy can reach back
+        if iwide or ipos >= CWINDOW:
+            ireach.next = CWINDOW
+        else:
+            ireach.next = ipos
+        if owide or opos >= OREACH:
+            oreach.next = OREACH
+        else:
+            oreach.next = opos
+
+    @always(clk.posedge)
+    def totals():
+        if CONTEXTS and swap:
+            c_itotal[ctx].next = o_itotal + ((o_iprogress - iprev) & LMASK)
+            c_ototal[ctx].next = o_ototal + ((o_oprogress - oprev) & LMASK)
+            o_itotal.next = c_itotal[nctx]
+            o_ototal.next = c_ototal[nctx]
+            iprev.next = c_iprogress[nctx]
+            oprev.next = c_oprogress[nctx]
+        else:
+            if jstart:
+                o_itotal.next = 0
+                o_ototal.next = 0
+            else:
+                o_itotal.next = o_itotal + ((o_iprogress - iprev) & LMASK)
+                o_ototal.next = o_ototal + ((o_oprogress - oprev) & LMASK)
+            iprev.next = o_iprogress
+            oprev.next = o_oprogress
+
+    if PERF:
+        pcount = [Signal(modbv(0)[PERFBITS:]) for _ in range(NPERF)]
+
+        @always(clk.posedge)
+        def perf():
+            if reset or jstart:
+                for k in range(NPERF):
+                    pcount[k].next = 0
+            else:
+                pcount[int(state)].next = pcount[int(state)] + 1
+                # A stall is counted one cycle after it
+                if stall != 0:
+                    pcount[int(stall)].next = pcount[int(stall)] + 1
+            o_pdata.next = pcount[i_paddr]
+
+    if STATS:
+        scount = [Signal(modbv(0)[PERFBITS:]) for _ in range(NSTATS)]
+        pstate = Signal(d_state.IDLE)
+
+        @always(clk.posedge)
+        def stats():
+            # A literal goes from SEARCH to CSTATIC, a match to DISTANCE
+            pstate.next = state
+            if reset or jstart:
+                for k in range(NSTATS):
+                    scount[k].next = 0
+            elif pstate == d_state.SEARCH and state == d_state.CSTATIC:
+                scount[ST_LITERALS].next = scount[ST_LITERALS] + 1
+            elif pstate != d_state.DISTANCE and state == d_state.DISTANCE:
+                scount[ST_MATCHES].next = scount[ST_MATCHES] + 1
+                scount[ST_MBYTES].next = scount[ST_MBYTES] + mlength
+                scount[ST_LENGTH + mlength - 3].next = \
+                    scount[ST_LENGTH + mlength - 3] + 1
+                bucket = 0
+                for k in range(NSTATS - ST_DIST - 1):
+                    if cur_dist > (1 << k):
+                        bucket = k + 1
+                scount[ST_DIST + bucket].next = scount[ST_DIST + bucket] + 1
+            o_sdata.next = scount[i_saddr]
+
+    if TRACING:
+        # cycle, d_state, di, do and o_done seen at the previous clock
+        tlast = [0, int(d_state.IDLE), 0, 0, False]
+
+        @always(clk.posedge)
+        def trace():
+            # An event shows one cycle after the state that caused it
+            cycle, tstate, tdi, tdo, tdone = tlast
+            for event, seen in ((t_event.START, jstart),
+                                (t_event.CHECKPOINT, o_cpoint),
+                                (tevent, tevent != t_event.NONE),
+                                (t_event.END, o_done and not tdone)):
+                if seen:
+                    tracer.record(cycle, int(event), tstate, tdi, tdo)
+            if int(state) != tstate:
+                tracer.record(cycle + 1, int(t_event.STATE), int(state),
+                              int(di), int(do))
+            tlast[:] = cycle + 1, int(state), int(di), int(do), bool(o_done)
+
     @always(clk.posedge)
     def fill_buf():
         if reset:
-            print("FILL RESET")
             nb.next = 0
+            ifilled.next = False
         else:
-            if isize < 4:
+            if ifill >= 4:
+                ifilled.next = True
+            if CONTEXTS and swap:
+                c_ifilled[ctx].next = ifilled
+                ifilled.next = c_ifilled[nctx]
+            if not ifilled and ifill < 4:
                 nb.next = 0
                 if FAST:
-                    old_di.next = 0
-            elif i_mode == STARTC or i_mode == STARTD:
+                    old_di.next = ibase
+            elif i_mode == STARTC or i_mode == STARTD or i_mode == RAWD:
                 nb.next = 0
+                ifilled.next = False
                 if FAST:
                     old_di.next = 0
+            elif state == d_state.IDLE and pend:
+                # The queued job starts
+                nb.next = 0
+                ifilled.next = False
+                if FAST:
+                    old_di.next = pend_base
+            elif CONTEXTS and state == d_state.RESTORE and not filled:
+                # Reload the window of the resumed context
+                nb.next = 0
+                b1.next = iram[ibank | di & IBS]
+                b2.next = iram[ibank | di+1 & IBS]
+                b3.next = iram[ibank | di+2 & IBS]
+                b4.next = iram[ibank | di+3 & IBS]
+                fcount.next = 4
+                old_di.next = di
             else:
                 """
                 if do_compress:
                     print("FILL", di, old_di, nb, b1, b2, b3, b4)
                 """
                 if FAST:
-                    shift = (di - old_di) * 8
+                    shift = ((di - old_di) & LMASK) * 8
                     """
                     if shift != 0:
                         print("shift", shift, cwindow, b1, b2, b3, b4)
@@ -455,10 +1254,12 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                 # print("old di fcount", old_di, di, fcount)
                 # print("irbyte read", di, fcount, isize, irbyte)
 
-                if not LOWLUT:
-                    b1.next = iram[di & IBS]
-                    b2.next = iram[di+1 & IBS]
-                    b3.next = iram[di+2 & IBS]
+                if not RBUF:
+                    b1.next = iram[ibank | di & IBS]
+                    b2.next = iram[ibank | di+1 & IBS]
+                    b3.next = iram[ibank | di+2 & IBS]
+                    if FPIPE or streaming and not do_compress:
+                        b4.next = iram[ibank | di+3 & IBS]
 
                 if old_di == di:
                     """
@@ -466,16 +1267,19 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                         print("fcount", fcount)
                     """
                     rb = irbyte
-                    if LOWLUT:
+                    if RBUF:
                         if fcount >= 4:
                             nb.next = True
                     else:
-                        rb = iram[di+fcount & IBS]
+                        rb = iram[ibank | di+fcount & IBS]
                         nb.next = True
 
-                    if LOWLUT:
+                    if RBUF:
                         fcount.next = rcount
-                        if rcount == 1:
+                        if rcount == fcount:
+                            # rcount stays at RMAX, irbyte is past the bytes
+                            pass
+                        elif rcount == 1:
                             b1.next = rb
                         elif rcount == 2:
                             b2.next = rb
@@ -485,7 +1289,18 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                             b4.next = rb
                         elif rcount == 5:
                             b5.next = rb
-                        if rcount < 5:
+                        elif MATCH10:
+                            if rcount == 6:
+                                b6.next = rb
+                            elif rcount == 7:
+                                b7.next = rb
+                            elif rcount == 8:
+                                b8.next = rb
+                            elif rcount == 9:
+                                b9.next = rb
+                            elif rcount == 10:
+                                b10.next = rb
+                        if rcount < RMAX:
                             rcount.next = rcount + 1
                     elif fcount == 4:
                         b5.next = rb
@@ -505,17 +1320,19 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                             fcount.next = fcount + 1
                 else:
                     # print("fcount set", fcount)
-                    if LOWLUT:
+                    if RBUF:
                         rcount.next = 0
                         fcount.next = 0
                     else:
                         fcount.next = 4
-                        b4.next = iram[di+3 & IBS]
+                        b4.next = iram[ibank | di+3 & IBS]
 
                 old_di.next = di
 
     def get4(boffset, width):
-        return (b41 >> (dio + boffset)) & ((1 << width) - 1)
+        # Two shifts, in Verilog dio + boffset has the width of dio when
+        # boffset is the constant 1
+        return (b41 >> dio >> boffset) & ((1 << width) - 1)
         # return b41[dio + boffset + width: dio + boffset]
 
     def adv(width):
@@ -559,6 +1376,17 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
             flush.next = True
         doo.next = doo_next
 
+    def static_length(lcode):
+        # Length of a literal/length code in the fixed tree
+        if lcode < 144:
+            return 8
+        elif lcode < 256:
+            return 9
+        elif lcode < 280:
+            return 7
+        else:
+            return 8
+
     def do_flush():
         # print("FLUSH")
         flush.next = False
@@ -566,6 +1394,12 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
         o_oprogress.next = do + 1
         do.next = do + 1
 
+    def fail():
+        # A speculative decode met data that is not deflate
+        o_fail.next = True
+        o_done.next = True
+        state.next = d_state.IDLE
+
     def rev_bits(b, nb):
         if b >= 1 << nb:
             raise Error("too few bits")
@@ -598,67 +1432,165 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
 
     @always(clk.posedge)
     def io_logic():
-        o_byte.next = oram[i_raddr & OBS]
-        if i_mode == WRITE:
+        if READ_ALWAYS or i_re or i_mode == READ:
+            # Forward the byte which is written to oram in this cycle
+            entry = obyte
+            if oaddr != (i_raddr & OBS):
+                entry = oram[obank | i_raddr & OBS]
+            o_byte.next = entry[8:]
+            o_entry.next = entry
+        if CONTEXTS and swap:
+            c_isize[ctx].next = isize
+            isize.next = c_isize[nctx]
+        elif i_we or i_mode == WRITE:
             # print("WRITE:", i_addr, i_data)
-            iram[i_waddr & IBS].next = i_data
+            iram[ibank | i_waddr & IBS].next = i_data
             isize.next = i_waddr
 
     @always(clk.posedge)
     def logic():
         if reset:
-            print("DEFLATE RESET")
             state.next = d_state.IDLE
             o_done.next = False
-            # prev_method.next = 3  # Illegal value
+            pend.next = False
+            o_hreq.next = False
+            far.next = False
         else:
 
-            if state == d_state.IDLE:
+            jstart.next = False
+            o_cpoint.next = False
+            o_wait.next = False
+            if ipos >= CWINDOW:
+                iwide.next = True
+            if opos >= OREACH:
+                owide.next = True
+            if TRACING:
+                tevent.next = t_event.NONE
+            if PERF:
+                stall.next = 0
+            sprime.next = True
+            lwe.next = False
+            dlwe.next = False
+
+            if (spec and not streaming and iavail <= 2 and
+                    state != d_state.IDLE and state != d_state.PRESET):
+                # A speculative decode ran out of input
+                fail()
+            elif state == d_state.IDLE:
+
+                jmode = int(i_mode)
+                jibase = 0
+                jobase = 0
+                if pend:
+                    pend.next = False
+                    if pend_c:
+                        jmode = STARTC
+                    else:
+                        jmode = STARTD
+                    jibase = int(pend_base)
+                    jobase = int(o_oprogress)
 
-                if COMPRESS and i_mode == STARTC:
+                if COMPRESS and jmode == STARTC:
 
-                    print("STARTC")
                     do_compress.next = True
                     # method.next = 1
                     o_done.next = False
-                    o_iprogress.next = 0
-                    o_oprogress.next = 0
-                    di.next = 0
+                    o_iprogress.next = jibase
+                    o_oprogress.next = jobase
+                    jstart.next = True
+                    ibase.next = jibase
+                    obase.next = jobase
+                    cbase.next = jibase
+                    iwide.next = False
+                    owide.next = False
+                    di.next = jibase
                     dio.next = 0
-                    do.next = 0
+                    do.next = jobase
                     doo.next = 0
                     filled.next = True
-                    cur_static.next = 0
                     cur_cstatic.next = 0
-                    state.next = d_state.STATIC
+                    state.next = d_state.CSTATIC
 
-                elif DECOMPRESS and i_mode == STARTD:
+                elif DECOMPRESS and jmode == STARTD:
 
                     maxBits.next = 9
                     instantMaxBit.next = 9
-                    prev_method.next = 3
                     do_compress.next = False
                     o_done.next = False
-                    o_iprogress.next = 0
-                    o_oprogress.next = 0
-                    di.next = 2
+                    o_iprogress.next = jibase
+                    o_oprogress.next = jobase
+                    jstart.next = True
+                    ibase.next = jibase
+                    obase.next = jobase
+                    owide.next = False
+                    di.next = jibase + 2
                     dio.next = 0
                     # oaddr.next = 0
-                    do.next = 0
+                    do.next = jobase
                     doo.next = 0
                     filled.next = True
                     first_block.next = True
+                    spec.next = False
+                    o_fail.next = False
                     state.next = d_state.HEADER
 
+                elif DECOMPRESS and not LOWLUT and jmode == RAWD:
+
+                    maxBits.next = 9
+                    instantMaxBit.next = 9
+                    do_compress.next = False
+                    o_done.next = False
+                    o_iprogress.next = i_waddr
+                    o_oprogress.next = jobase
+                    jstart.next = True
+                    ibase.next = i_waddr
+                    obase.next = jobase
+                    owide.next = False
+                    di.next = i_waddr
+                    dio.next = i_data[3:]
+                    do.next = jobase
+                    doo.next = 0
+                    spec.next = RAWMODE
+                    o_fail.next = False
+                    if RAWMODE:
+                        cur_i.next = 0
+                        state.next = d_state.PRESET
+                    else:
+                        filled.next = False
+                        state.next = d_state.HEADER
+
                 else:
                     pass
 
+            elif state == d_state.PRESET:
+
+                # Mark the unknown window with the ring addresses
+                if not RAWMODE:
+                    pass
+                elif cur_i < OBSIZE:
+                    oaddr.next = cur_i
+                    obyte.next = MARK | cur_i
+                    cur_i.next = cur_i + 1
+                else:
+                    filled.next = False
+                    state.next = d_state.HEADER
+
             elif state == d_state.HEADER:
 
                 if not DECOMPRESS:
                     pass
+                elif i_stop != 0 and concat(di, dio) == i_stop:
+                    # The next block is decompressed by another core
+                    o_iprogress.next = di
+                    o_done.next = True
+                    state.next = d_state.IDLE
                 elif not filled:
                     filled.next = True
+                elif iavail <= 4 and streaming:
+                    # fetch more bytes, the window fills after 4 of them
+                    if PERF:
+                        stall.next = PC_INPUT
+                    o_wait.next = True
                 elif not nb:
                     pass
                 # Read block header
@@ -677,14 +1609,14 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                 else:
                     if not ONEBLOCK:
                         if get4(0, 1):
-                            print("final")
                             final.next = True
                         else:
                             final.next = False
                     if DYNAMIC:
                         hm = get4(1, 2)
                         method.next = hm
-                        print("method", hm)
+                        if TRACING:
+                            tevent.next = t_event.HEADER
                         # print(di, dio, nb, b1, b2, b3, b4, hm, isize)
                         if hm == 2:
                             if not DYNAMIC:
@@ -696,15 +1628,12 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                             static.next = False
                             adv(3)
                         elif hm == 1:
+                            # Fixed tree, decode from stat_leaves
                             static.next = True
-                            cur_static.next = 0
-                            print("prev method is", prev_method)
-                            if prev_method == 1:
-                                print("skip HF init")
-                                state.next = d_state.NEXT
-                                cur_next.next = 0
-                            else:
-                                state.next = d_state.STATIC
+                            maxBits.next = 9
+                            instantMaxBit.next = 9
+                            state.next = d_state.NEXT
+                            cur_next.next = 0
                             adv(3)
                         elif hm == 0:
                             state.next = d_state.COPY
@@ -715,12 +1644,12 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                             adv(skip + 16)
                             cur_i.next = 0
                             offset.next = 7
+                        elif spec:
+                            fail()
                         else:
                             state.next = d_state.IDLE
                             print("Bad method")
                             raise Error("Bad method")
-                        prev_method.next = hm
-                        print("set prev", hm)
                     else:
                         # static.next = True
                         method.next = 1
@@ -741,45 +1670,95 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     pass
                 elif not FAST and not filled:
                     filled.next = True
-                elif LOWLUT and fcount == 0:
+                elif RBUF and fcount < 3:
                     pass
+                elif oahead >= OBSIZE - 1:
+                    # print("HOLDC")
+                    if PERF:
+                        stall.next = PC_HOLDB
                 elif cur_cstatic == 0:
                     flush.next = False
                     ob1.next = 0
                     adler1.next = 1
                     adler2.next = 0
                     ladler1.next = 0
-                    oaddr.next = 0
+                    oaddr.next = do
                     obyte.next = 0x78
                     cur_cstatic.next = 1
                 elif cur_cstatic == 1:
-                    oaddr.next = 1
+                    oaddr.next = do + 1
                     obyte.next = 0x9c
-                    do.next = 2
+                    do.next = do + 2
                     cur_cstatic.next = 2
                 elif cur_cstatic == 2:
-                    put(0x3, 3)
+                    if i_cpoint != 0:
+                        put(0x2, 3)  # Not final, a checkpoint may follow
+                    else:
+                        put(0x3, 3)
                     cur_cstatic.next = 3
                 elif flush:
                     # print("flush", do, ob1)
                     oaddr.next = do
                     obyte.next = ob1
                     do_flush()
-                elif di >= isize - 10 and i_mode != IDLE:
-                    print("P", di, isize)
-                    pass
-                elif di > isize:
-                    if cur_cstatic == 3:
+                elif cur_cstatic >= 11:
+                    # Full flush: empty stored block and the next fixed block
+                    if cur_cstatic == 11:
+                        put(0x0, 3)
+                        cur_cstatic.next = 12
+                    elif cur_cstatic == 12:
+                        if doo != 0:
+                            oaddr.next = do
+                            obyte.next = ob1
+                            do_flush()
+                            doo.next = 0
+                        cur_cstatic.next = 13
+                    elif cur_cstatic < 17:
+                        # LEN 0000 and NLEN FFFF
+                        oaddr.next = do
+                        if cur_cstatic < 15:
+                            obyte.next = 0x00
+                        else:
+                            obyte.next = 0xFF
+                        do.next = do + 1
+                        o_oprogress.next = do + 1
+                        cur_cstatic.next = cur_cstatic + 1
+                    elif cur_cstatic == 17:
+                        o_cpoint.next = True
+                        o_cpin.next = di
+                        o_cpout.next = concat(do, intbv(0)[3:])
+                        cbase.next = di
+                        iwide.next = False
+                        put(0x2, 3)
+                        cur_cstatic.next = 3
+                    elif cur_cstatic == 18:
+                        # Empty final block behind the checkpoint blocks
+                        put(0x3, 3)
+                        cur_cstatic.next = 19
+                    else:
+                        cs_i = EndOfBlock
+                        outlen = static_length(cs_i)
+                        outbits = out_codes[cs_i]
+                        put(outbits, outlen)
                         cur_cstatic.next = 4
-                        print("Put EOF", do)
+                elif iavail <= 10 and streaming:
+                    if TRACING:
+                        tevent.next = t_event.INPUT
+                    if PERF:
+                        stall.next = PC_INPUT
+                    o_wait.next = True
+                elif iavail < 0:
+                    if cur_cstatic == 3:
+                        if i_cpoint != 0:
+                            cur_cstatic.next = 18
+                        else:
+                            cur_cstatic.next = 4
                         cs_i = EndOfBlock
-                        outlen = codeLength[cs_i]
+                        outlen = static_length(cs_i)
                         outbits = out_codes[cs_i]
-                        print("EOF BITS:", cs_i, outlen, outbits)
                         put(outbits, outlen)
                     elif cur_cstatic == 4:
                         cur_cstatic.next = 5
-                        print("calc end adler")
                         adler2.next = (adler2 + ladler1) % 65521
                         if doo != 0:
                             oaddr.next = do
@@ -787,43 +1766,49 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                             do.next = do + 1
                     elif cur_cstatic == 5:
                         cur_cstatic.next = 6
-                        print("c1", adler2)
                         oaddr.next = do
                         obyte.next = adler2 >> 8
                         do.next = do + 1
                         o_oprogress.next = do + 1
                     elif cur_cstatic == 6:
                         cur_cstatic.next = 7
-                        print("c2")
                         oaddr.next = do
                         obyte.next = adler2 & 0xFF
                         do.next = do + 1
                         o_oprogress.next = do + 1
                     elif cur_cstatic == 7:
                         cur_cstatic.next = 8
-                        print("c3", adler1)
                         oaddr.next = do
                         obyte.next = adler1 >> 8
                         do.next = do + 1
                         o_oprogress.next = do + 1
                     elif cur_cstatic == 8:
                         cur_cstatic.next = 9
-                        print("c4")
                         oaddr.next = do
                         obyte.next = adler1 & 0xFF
                         o_oprogress.next = do + 1
                     elif cur_cstatic == 9:
                         cur_cstatic.next = 10
-                        print("EOF finish", do)
                         o_done.next = True
                         state.next = d_state.IDLE
                     else:
                         print(cur_cstatic, isize)
                         raise Error("???")
+                elif i_cpoint != 0 and ipos >= i_cpoint:
+                    # Full flush, the next block starts a slice
+                    cs_i = EndOfBlock
+                    outlen = static_length(cs_i)
+                    outbits = out_codes[cs_i]
+                    put(outbits, outlen)
+                    cur_cstatic.next = 11
                 else:
                     # print("fcount", fcount)
                     # bdata = b1
-                    bdata = iram[di & IBS]
+                    bdata = b1
+                    if not CBMODE:
+                        bdata = iram[ibank | di & IBS]
+                    sw1.next = b1
+                    sw2.next = b2
                     o_iprogress.next = di
                     adler1_next = (adler1 + bdata) % 65521
                     adler1.next = adler1_next
@@ -837,6 +1822,9 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
 
                 if not COMPRESS:
                     pass
+                elif oahead >= OBSIZE - 1:
+                    if PERF:
+                        stall.next = PC_HOLDB
                 elif flush:
                     do_flush()
                 elif do_init:
@@ -844,7 +1832,7 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     outcarrybits.next = 0
                     lencode = mlength + 254
                     # print("fast:", distance, di, isize, match)
-                    outlen = codeLength[lencode]
+                    outlen = static_length(lencode)
                     outbits = out_codes[lencode]
                     # print("BITS:", outlen, outbits)
                     put(outbits, outlen)
@@ -885,9 +1873,14 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
 
                 if not COMPRESS:
                     pass
-                elif cur_i < di:
+                elif CBMODE and cur_i != di and sprime:
+                    sprime.next = False
+                elif cur_i != di:
                     # print("CHECKSUM", cur_i, di, iram[cur_i])
-                    bdata = iram[cur_i & IBS]
+                    bdata = srbyte
+                    if not CBMODE:
+                        bdata = iram[ibank | cur_i & IBS]
+                    sprime.next = False
                     adler1_next = (adler1 + bdata) % 65521
                     adler1.next = adler1_next
                     adler2.next = (adler2 + ladler1) % 65521
@@ -910,45 +1903,54 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     match = 3
                     mdone = True
 
-                    if di < isize - 4 and \
-                            iram[fmatch2 & IBS] == b4:
+                    if FPIPE:
+                        # ematch was compared in the previous cycle
+                        for k in range(RMAX - 3):
+                            if not ematch[k]:
+                                break
+                            match = 4 + k
+                        # fill_buf shifts the matched bytes into cwindow
+                        if fcount < match:
+                            mdone = False
+                    elif iavail > 4 and \
+                            iram[ibank | fmatch2 & IBS] == b4:
                         match = 4
                         if fcount < 5:
                             mdone = False
                             # print("fcount", fcount)
-                        elif di < isize - 5 and \
-                                iram[fmatch2+1 & IBS] == b5:
+                        elif iavail > 5 and \
+                                iram[ibank | fmatch2+1 & IBS] == b5:
                             match = 5
                             if MATCH10:
                                 if fcount < 6:
                                     mdone = False
                                     # print("fcount", fcount)
-                                elif di < isize - 6 and \
-                                        iram[fmatch2+2 & IBS] == b6:
+                                elif iavail > 6 and \
+                                        iram[ibank | fmatch2+2 & IBS] == b6:
                                     match = 6
                                     if fcount < 7:
                                         mdone = False
                                         # print("fcount", fcount)
-                                    elif di < isize - 7 and \
-                                            iram[fmatch2+3 & IBS] == b7:
+                                    elif iavail > 7 and \
+                                            iram[ibank | fmatch2+3 & IBS] == b7:
                                         match = 7
                                         if fcount < 8:
                                             mdone = False
                                             # print("fcount", fcount)
-                                        elif di < isize - 8 and \
-                                                iram[fmatch2+4 & IBS] == b8:
+                                        elif iavail > 8 and \
+                                                iram[ibank | fmatch2+4 & IBS] == b8:
                                             match = 8
                                             if fcount < 9:
                                                 mdone = False
                                                 # print("fcount", fcount)
-                                            elif di < isize - 9 and \
-                                                    iram[fmatch2+5 & IBS] == b9:
+                                            elif iavail > 9 and \
+                                                    iram[ibank | fmatch2+5 & IBS] == b9:
                                                 match = 9
                                                 if fcount < 10:
                                                     mdone = False
                                                     # print("fcount", fcount)
-                                                elif di < isize - 10 and \
-                                                        iram[fmatch2+6 & IBS] == b10:
+                                                elif iavail > 10 and \
+                                                        iram[ibank | fmatch2+6 & IBS] == b10:
                                                     match = 10
 
                     if mdone:
@@ -967,16 +1969,33 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
 
                 if not COMPRESS:
                     pass
-                elif LOWLUT and fcount < 3:
+                elif RBUF and fcount < 3:
                     # print("SEARCH", fcount)
                     pass
+                elif oahead >= OBSIZE - 1:
+                    if PERF:
+                        stall.next = PC_HOLDB
                 else:
                     # print("cs",  cur_search, di, di - CWINDOW)
-                    if cur_search >= 0 \
-                             and cur_search >= di - CWINDOW \
-                             and di < isize - 3:
+                    if sdist != 0 and sdist <= CWINDOW and sdist <= ireach \
+                             and iavail > 3:
+
+                        if FAST and FPIPE:
+                            # The registered selection of this window
+                            pfound = nfound
+                            pmatch = nfirst
+                            if pdi == di:
+                                pfound = cfound
+                                pmatch = cfirst
+                            if pdi != di and ((di - pdi) & LMASK) != 1:
+                                pass
+                            elif not pfound or pmatch >= ireach:
+                                cur_search.next = di
+                            else:
+                                dlength.next = pmatch
+                                state.next = d_state.SEARCHF
 
-                        if FAST:
+                        elif FAST:
                             found = 0
                             fmatch = 0
                             for si in range(CWINDOW):
@@ -986,16 +2005,52 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                                     fmatch = si
                                     found = 1
                                     break
-                            if not found or di - fmatch - 1 < 0:
-                                cur_search.next = -1
+                            if not found or fmatch >= ireach:
+                                cur_search.next = di
                                 # print("NO FSEARCH")
                             else:
                                 dlength.next = fmatch
                                 state.next = d_state.SEARCHF
 
-                        elif iram[cur_search & IBS] == b1 and \
-                                iram[cur_search + 1 & IBS] == b2 and \
-                                iram[cur_search + 2 & IBS] == b3:
+                        elif CBMODE:
+                            # srbyte is the byte at cur_search
+                            if sprime:
+                                sprime.next = False
+                            elif srbyte == b1 and sw1 == b2 and sw2 == b3:
+                                more.next = 4
+                                state.next = d_state.SEARCH10
+                            else:
+                                sw1.next = srbyte
+                                sw2.next = sw1
+                                sprime.next = False
+                                cur_search.next = cur_search - 1
+
+                        elif NSLOTS > 1:
+                            # The nearest matching slot of the next NSLOTS
+                            found = 0
+                            fslot = 0
+                            for si in range(NSLOTS):
+                                if sdist + si <= CWINDOW and \
+                                        sdist + si <= ireach and \
+                                        iram[ibank | cur_search - si & IBS] \
+                                        == b1 and \
+                                        iram[ibank | cur_search - si + 1 & IBS] \
+                                        == b2 and \
+                                        iram[ibank | cur_search - si + 2 & IBS] \
+                                        == b3:
+                                    fslot = si
+                                    found = 1
+                                    break
+                            if found:
+                                cur_search.next = cur_search - fslot
+                                more.next = 4
+                                state.next = d_state.SEARCH10
+                            else:
+                                cur_search.next = cur_search - NSLOTS
+
+                        elif iram[ibank | cur_search & IBS] == b1 and \
+                                iram[ibank | cur_search + 1 & IBS] == b2 and \
+                                iram[ibank | cur_search + 2 & IBS] == b3:
                             more.next = 4
                             state.next = d_state.SEARCH10
 
@@ -1009,7 +2064,7 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                         # o_iprogress.next = di
                         if not FAST:
                             filled.next = False
-                        outlen = codeLength[bdata]
+                        outlen = static_length(bdata)
                         outbits = out_codes[bdata]
                         # print("CBITS:", bdata, outlen, outbits)
                         put(outbits, outlen)
@@ -1042,14 +2097,25 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                             elif more == 10:
                                 cbyte = b10
 
-                        if di < isize - more and \
-                                iram[cur_search + more - 1 & IBS] == cbyte:
+                        if CBMODE and sprime:
+                            sprime.next = False
+                            mdone = False
+                        elif fcount < more:
+                            # Not loaded yet after a quick search
+                            mdone = False
+                        elif CBMODE:
+                            if iavail > more and srbyte == cbyte:
+                                more.next = more + 1
+                                sprime.next = False
+                                mdone = False
+                        elif iavail > more and \
+                                iram[ibank | cur_search + more - 1 & IBS] == cbyte:
                             more.next = more + 1
                             mdone = False
 
                     if mdone:
                         match = more - 1
-                        distance = di - cur_search
+                        distance = int(sdist)
                         # print("d/l", distance, match)
                         cur_dist.next = distance
                         do_init.next = True
@@ -1061,40 +2127,23 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                         mlength.next = match
                         state.next = d_state.DISTANCE
 
-            elif state == d_state.STATIC:
-
-                for stat_i in range(0, 144):
-                    codeLength[stat_i].next = 8
-                for stat_i in range(144, 256):
-                    codeLength[stat_i].next = 9
-                for stat_i in range(256, 280):
-                    codeLength[stat_i].next = 7
-                for stat_i in range(280, 288):
-                    codeLength[stat_i].next = 8
-                numCodeLength.next = 288
-                if COMPRESS and do_compress:
-                    state.next = d_state.CSTATIC
-                elif DYNAMIC:
-                    cur_HF1.next = 0
-                    state.next = d_state.HF1
-                else:
-                    cur_next.next = 0
-                    state.next = d_state.NEXT
-
             elif state == d_state.BL:
 
                 if not DECOMPRESS or not DYNAMIC:
                     pass
                 elif not filled:
                     filled.next = True
+                elif iavail <= 4 and streaming:
+                    # fetch more bytes
+                    if PERF:
+                        stall.next = PC_INPUT
+                    o_wait.next = True
                 elif numLiterals == 0:
-                    print(di, isize)
                     numLiterals.next = 257 + get4(0, 5)
-                    print("NL:", 257 + get4(0, 5))
                     numDistance.next = 1 + get4(5, 5)
-                    print("ND:", 1 + get4(5, 5))
                     b_numCodeLength.next = 4 + get4(10, 4)
-                    print("NCL:", 4 + get4(10, 4))
+                    if TRACING:
+                        tevent.next = t_event.TREE
                     numCodeLength.next = 0
                     adv(14)
                 else:
@@ -1136,21 +2185,19 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                         howOften.next = 11 + get4(0, 7)
                         lastToken.next = 0
                         n_adv = 7
-                    else:
+                    elif not spec:
                         raise Error("Invalid data")
 
                     # print(numCodeLength, howOften, code, di, n_adv)
-                    if n_adv != 0:
-                        adv(n_adv)
-
-                    state.next = d_state.REPEAT
-
-                    spread_i.next = 0
+                    if code > 18:
+                        fail()
+                    else:
+                        if n_adv != 0:
+                            adv(n_adv)
+                        state.next = d_state.REPEAT
+                        spread_i.next = 0
 
                 elif spread_i < 32:
-                    if spread_i == 0:
-                        print("FILL UP")
-
                     dbl = 0
                     if spread_i + numLiterals < numCodeLength:
                         dbl = int(codeLength[spread_i + numLiterals])
@@ -1178,7 +2225,6 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
             elif state == d_state.DISTTREE:
 
                 if DECOMPRESS and DYNAMIC:
-                    print("DISTTREE")
                     for dist_i in range(32):
                         codeLength[dist_i].next = distanceLength[dist_i]
                         # print(dist_i, distanceLength[dist_i])
@@ -1195,6 +2241,11 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     codeLength[numCodeLength].next = lastToken
                     howOften.next = howOften - 1
                     numCodeLength.next = numCodeLength + 1
+                elif iavail <= 4 and streaming:
+                    # fetch more bytes
+                    if PERF:
+                        stall.next = PC_INPUT
+                    o_wait.next = True
                 elif numCodeLength < numLiterals + numDistance:
                     cur_next.next = 0
                     state.next = d_state.NEXT
@@ -1206,21 +2257,22 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                 if DECOMPRESS and DYNAMIC:
                     if cur_HF1 < len(bitLengthCount):
                         bitLengthCount[cur_HF1].next = 0
-                    if cur_HF1 < len(d_leaves) and DYNAMIC:
+                    if cur_HF1 < NDLEAVES and DYNAMIC:
                         dlwaddr.next = cur_HF1
                         dwleaf.next = 0
+                        dlwe.next = True
                         # d_leaves[cur_HF1].next = 0
-                    if method != 4 and cur_HF1 < len(leaves):
+                    if method != 4 and cur_HF1 < NLEAVES:
                         lwaddr.next = cur_HF1
                         wleaf.next = 0
+                        lwe.next = True
                         # leaves[cur_HF1].next = 0
-                    limit = len(leaves)
+                    limit = NLEAVES
                     if method == 4 and DYNAMIC:
-                        limit = len(d_leaves)
+                        limit = NDLEAVES
                     if cur_HF1 < limit:
                         cur_HF1.next = cur_HF1 + 1
                     else:
-                        print("DID HF1 INIT")
                         cur_i.next = 0
                         state.next = d_state.HF1INIT
 
@@ -1263,7 +2315,6 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                                 maxBits.next = cur_i
                     cur_i.next = cur_i + 1
                 else:
-                    print(minBits, maxBits)
                     t = InstantMaxBit
                     if DYNAMIC and method == 4:
                         if t > int(d_maxBits):
@@ -1275,13 +2326,11 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                             t = int(maxBits)
                         instantMaxBit.next = t
                         instantMask.next = (1 << t) - 1
-                    print((1 << t) - 1)
                     state.next = d_state.HF3
                     cur_i.next = minBits
                     code.next = 0
                     for hf2_i in range(len(nextCode)):
                         nextCode[hf2_i].next = 0
-                    print("to HF3")
 
             elif state == d_state.HF3:
                 # find bit code for first element of each bitLength group
@@ -1301,20 +2350,25 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                         state.next = d_state.HF4
                         cur_i.next = 0
                         spread_i.next = 0
-                        print("to HF4")
 
             elif state == d_state.HF4_2:
 
                 if DECOMPRESS and DYNAMIC:
                     canonical = nextCode[bits]
                     nextCode[bits].next = nextCode[bits] + 1
-                    if bits > MaxCodeLength:
+                    if bits > MaxCodeLength and not spec:
                         raise Error("too many bits: %d" % bits)
-                    # print(canonical, bits)
-                    reverse.next = rev_bits(canonical, bits)
-                    # print("LEAF: ", spread_i, bits, reverse, canonical)
-                    leaf.next = makeLeaf(spread_i, bits)
-                    state.next = d_state.HF4_3
+                    if spec and (bits > MaxCodeLength or
+                                 canonical >= (1 << bits)):
+                        # Over-subscribed lengths
+                        fail()
+                    else:
+                        # print(canonical, bits)
+                        reverse.next = rev_bits(canonical, bits)
+                        # print("LEAF: ", spread_i, bits, reverse,
+                        #       canonical)
+                        leaf.next = makeLeaf(spread_i, bits)
+                        state.next = d_state.HF4_3
 
             elif state == d_state.HF4_3:
 
@@ -1323,6 +2377,7 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                 elif DYNAMIC and method == 4:
                     dwleaf.next = leaf
                     dlwaddr.next = reverse
+                    dlwe.next = True
                     # d_leaves[reverse].next = leaf
                     if bits <= d_instantMaxBit:
                         if reverse + (1 << bits) <= d_instantMask:
@@ -1338,6 +2393,7 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                 else:
                     wleaf.next = leaf
                     lwaddr.next = reverse
+                    lwe.next = True
                     # leaves[reverse].next = leaf # makeLeaf(spread_i, bits)
                     # code_bits[spread_i].next = reverse
                     if bits <= instantMaxBit:
@@ -1369,7 +2425,6 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     if method == 3 and DYNAMIC:
                         state.next = d_state.DISTTREE
                     elif method == 4 and DYNAMIC:
-                        print("DEFLATE m2!")
                         state.next = d_state.NEXT
                     elif method == 2 and DYNAMIC:
                         numCodeLength.next = 0
@@ -1386,9 +2441,11 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                         # print(spread, spread_i)
                         dlwaddr.next = spread
                         dwleaf.next = makeLeaf(spread_i, codeLength[spread_i])
+                        dlwe.next = True
                     else:
                         lwaddr.next = spread
                         wleaf.next = makeLeaf(spread_i, codeLength[spread_i])
+                        lwe.next = True
                     # print("SPREAD:", spread, step, instantMask)
                     aim = instantMask
                     if method == 4 and DYNAMIC:
@@ -1410,7 +2467,7 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     # print("INIT:", di, dio, instantMaxBit, maxBits)
                     cto = get4(0, maxBits)
                     mask = (1 << instantMaxBit) - 1
-                    if DYNAMIC:
+                    if DYNAMIC and not static:
                         lraddr.next = (cto & mask)
                         filled.next = False
                     else:
@@ -1420,8 +2477,9 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     cur_next.next = instantMaxBit + 1
                     # print(cur_next, mask, leaf, maxBits)
                 # elif get_bits(leaf) >= cur_next:
-                elif DYNAMIC and get_bits(rleaf) >= cur_next:
-                    print("CACHE MISS", cur_next)
+                elif DYNAMIC and not static and get_bits(rleaf) >= cur_next:
+                    if TRACING:
+                        tevent.next = t_event.CACHE_MISS
                     cto = get4(0, maxBits)
                     mask = (1 << cur_next) - 1
                     lraddr.next = (cto & mask)
@@ -1430,19 +2488,22 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     cur_next.next = cur_next + 1
                 else:
                     the_leaf = rleaf
-                    if not DYNAMIC:
+                    if not DYNAMIC or static:
                         the_leaf = stat_leaf
                     # if get_bits(leaf) < 1:
                     # print(di, do, rleaf)
-                    if get_bits(the_leaf) < 1:
+                    if get_bits(the_leaf) >= 1:
+                        adv(get_bits(the_leaf))
+                        code.next = get_code(the_leaf)
+                        if DYNAMIC and method == 2:
+                            state.next = d_state.READBL
+                        else:
+                            state.next = d_state.INFLATE
+                    elif spec:
+                        fail()
+                    else:
                         print("< 1 bits: ")
                         raise Error("< 1 bits: ")
-                    adv(get_bits(the_leaf))
-                    code.next = get_code(the_leaf)
-                    if DYNAMIC and method == 2:
-                        state.next = d_state.READBL
-                    else:
-                        state.next = d_state.INFLATE
 
             elif state == d_state.D_NEXT:
 
@@ -1452,7 +2513,7 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     filled.next = True
                 elif cur_next == 0:
                     # print("D_INIT:", di, dio, d_instantMaxBit, d_maxBits)
-                    if d_instantMaxBit > InstantMaxBit:
+                    if d_instantMaxBit > InstantMaxBit and not spec:
                         raise Error("???")
                     token = code - 257
                     # print("token: ", token)
@@ -1466,7 +2527,8 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     # leaf.next = d_leaves[cto & mask]
                     cur_next.next = instantMaxBit + 1
                 elif get_bits(drleaf) >= cur_next:
-                    print("DCACHE MISS", cur_next)
+                    if TRACING:
+                        tevent.next = t_event.DCACHE_MISS
                     token = code - 257
                     # print("token: ", token)
                     extraLength = ExtraLengthBits[token]
@@ -1481,9 +2543,14 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
 
             elif state == d_state.D_NEXT_2:
 
-                if DECOMPRESS and DYNAMIC:
-                    if get_bits(drleaf) == 0:
+                if not DECOMPRESS or not DYNAMIC:
+                    pass
+                elif get_bits(drleaf) == 0 or get_code(drleaf) > 29:
+                    # Not a distance code
+                    if not spec:
                         raise Error("0 bits")
+                    fail()
+                else:
                     token = code - 257
                     # print("E2:", token, drleaf)
                     tlength = CopyLength[token]
@@ -1503,7 +2570,7 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     # print("mored:", mored)
                     distance += mored
                     # print("distance more:", distance, do, di, isize)
-                    if distance > do:
+                    if distance > oreach and not spec:
                         print(distance, do)
                         raise Error("distance too big")
                     adv(moreBits + extraLength + get_bits(drleaf))
@@ -1514,6 +2581,8 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     # cur_next.next = 0
                     cur_i.next = 0
                     oraddr.next = do - distance
+                    o_haddr.next = do - distance
+                    far.next = XMODE and distance > OBSIZE
                     state.next = d_state.COPY
 
             elif state == d_state.INFLATE:
@@ -1526,24 +2595,33 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                 elif method == 1 and not filled:
                     # print("INFLATE !F")
                     filled.next = True
-                elif di >= isize - 4 and not i_mode == IDLE:
-                    pass  # fetch more bytes
-                elif do >= i_raddr + OBSIZE:
-                    print("HOLDB")
-                    # filled.next = False
-                    pass
-                elif di > isize - 3:  # checksum is 4 bytes
+                elif iavail <= IWAIT and streaming and code != EndOfBlock:
+                    # fetch more bytes, the end of a block needs none
+                    if PERF:
+                        stall.next = PC_INPUT
+                    o_wait.next = True
+                elif oahead >= OBSIZE:
+                    if TRACING:
+                        tevent.next = t_event.HOLDB
+                    if PERF:
+                        stall.next = PC_HOLDB
+                elif iavail < 3 and not streaming:  # checksum is 4 bytes
                     state.next = d_state.IDLE
                     o_done.next = True
-                    print("NO EOF ", di)
-                    raise Error("NO EOF!")
+                    if spec:
+                        fail()
+                    else:
+                        print("NO EOF ", di)
+                        raise Error("NO EOF!")
                 elif code == EndOfBlock:
-                    print("EOF:", isize, di, do)
+                    if TRACING:
+                        tevent.next = t_event.EOB
                     if not ONEBLOCK and not final:
                         state.next = d_state.HEADER
                         filled.next = False
-                        print("New Block!")
                     else:
+                        # The byte after the stream, where its checksum is
+                        o_iprogress.next = di + (dio != 0)
                         o_done.next = True
                         state.next = d_state.IDLE
                 else:
@@ -1556,8 +2634,10 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                         cur_next.next = 0
                         state.next = d_state.NEXT
                         # raise Error("DF!")
-                    elif code == InvalidToken:
-                        raise Error("invalid token")
+                    elif code > 285:  # InvalidToken or no length code
+                        if not spec:
+                            raise Error("invalid token")
+                        fail()
                     else:
                         if not DYNAMIC or static:
                             token = code - 257
@@ -1571,18 +2651,27 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                             t = get4(extraLength, 5)
                             distanceCode = rev_bits(t, 5)
                             # print("dcode", distanceCode)
-                            distance = CopyDistance[distanceCode]
-                            # print("distance", distance)
-                            moreBits = ExtraDistanceBits[distanceCode >> 1]
-                            distance += get4(extraLength + 5, moreBits)
-                            # print("distance2", distance)
-                            adv(extraLength + 5 + moreBits)
-                            # print("adv", extraLength + 5 + moreBits)
-                            offset.next = (do - distance) & OBS
-                            length.next = tlength
-                            cur_i.next = 0
-                            oraddr.next = do - distance
-                            state.next = d_state.COPY
+                            if distanceCode > 29:
+                                # Fixed codes 30 and 31 are no distance
+                                if not spec:
+                                    raise Error("invalid distance code")
+                                fail()
+                            else:
+                                distance = CopyDistance[distanceCode]
+                                # print("distance", distance)
+                                moreBits = ExtraDistanceBits[
+                                    distanceCode >> 1]
+                                distance += get4(extraLength + 5, moreBits)
+                                # print("distance2", distance)
+                                adv(extraLength + 5 + moreBits)
+                                # print("adv", extraLength + 5 + moreBits)
+                                offset.next = (do - distance) & OBS
+                                length.next = tlength
+                                cur_i.next = 0
+                                oraddr.next = do - distance
+                                o_haddr.next = do - distance
+                                far.next = XMODE and distance > OBSIZE
+                                state.next = d_state.COPY
                         else:
                             if not DYNAMIC:
                                 print("DYNAMIC mode disabled")
@@ -1594,16 +2683,23 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
 
                 if not DECOMPRESS:
                     pass
-                elif cur_i == 0 and do + length >= i_raddr + OBSIZE:
+                elif cur_i == 0 and oahead + length >= OBSIZE:
                     # print("HOLDW", length, offset, cur_i, do, i_raddr)
-                    pass
-                elif di >= isize - 2:
+                    if PERF:
+                        stall.next = PC_HOLDW
+                elif iavail <= 2:
                     # print("HOLD2")
-                    pass
+                    if PERF:
+                        stall.next = PC_INPUT
+                    o_wait.next = True
                 elif DYNAMIC and method == 0:
                     if not filled:
                         # print("COPY !F")
                         filled.next = True
+                    elif spec and cur_i == 0 and \
+                            get4(0, 16) != (length ^ 0xFFFF):
+                        # NLEN is not the complement of LEN
+                        fail()
                     elif cur_i < length:
                         oaddr.next = do
                         obyte.next = b3
@@ -1620,10 +2716,27 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                         o_iprogress.next = di
                         state.next = d_state.HEADER
                         filled.next = False
-                        print("new block")
                     else:
+                        # di is still on NLEN
+                        o_iprogress.next = di + 2
                         o_done.next = True
                         state.next = d_state.IDLE
+                elif XMODE and far:
+                    # The source is not in oram anymore
+                    if cur_i == length:
+                        far.next = False
+                        cur_next.next = 0
+                        state.next = d_state.NEXT
+                    elif o_hreq and i_hack:
+                        oaddr.next = do
+                        obyte.next = i_hdata
+                        o_oprogress.next = do + 1
+                        do.next = do + 1
+                        o_haddr.next = o_haddr + 1
+                        o_hreq.next = cur_i + 1 < length
+                        cur_i.next = cur_i + 1
+                    else:
+                        o_hreq.next = True
                 elif cur_i < length + 2:
                     # print("L/O", length, offset, do)
                     oraddr.next = offset + cur_i
@@ -1658,21 +2771,108 @@ def deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
                     cur_next.next = 0
                     state.next = d_state.NEXT
 
+            elif state == d_state.RESTORE:
+
+                if not CONTEXTS or rcode == 0:
+                    state.next = d_state.IDLE
+                elif not filled:
+                    filled.next = True
+                elif not nb:
+                    pass
+                elif rcode == 1:
+                    state.next = d_state.INFLATE
+                else:
+                    state.next = d_state.COPY
+
             else:
 
                 print("unknown state?!")
                 state.next = d_state.IDLE
 
+            if CONTEXTS and swap:
+                # Park the active stream and resume stream nctx
+                if state == d_state.INFLATE:
+                    c_state[ctx].next = 1
+                elif state == d_state.COPY:
+                    c_state[ctx].next = 2
+                else:
+                    c_state[ctx].next = 0
+                c_di[ctx].next = di
+                c_dio[ctx].next = dio
+                c_do[ctx].next = do
+                c_doo[ctx].next = doo
+                c_method[ctx].next = method
+                c_final[ctx].next = final
+                c_static[ctx].next = static
+                c_maxBits[ctx].next = maxBits
+                c_instantMaxBit[ctx].next = instantMaxBit
+                c_d_maxBits[ctx].next = d_maxBits
+                c_d_instantMaxBit[ctx].next = d_instantMaxBit
+                c_code[ctx].next = code
+                c_cur_i[ctx].next = cur_i
+                c_length[ctx].next = length
+                c_ibase[ctx].next = ibase
+                c_obase[ctx].next = obase
+                c_owide[ctx].next = owide
+                c_iprogress[ctx].next = o_iprogress
+                c_oprogress[ctx].next = o_oprogress
+                c_done[ctx].next = o_done
+                # The buffer and tree writes repeat every cycle
+                c_oaddr[ctx].next = oaddr
+                c_obyte[ctx].next = obyte
+                c_lwaddr[ctx].next = lwaddr
+                c_wleaf[ctx].next = wleaf
+                c_dlwaddr[ctx].next = dlwaddr
+                c_dwleaf[ctx].next = dwleaf
+
+                rcode.next = c_state[nctx]
+                di.next = c_di[nctx]
+                dio.next = c_dio[nctx]
+                do.next = c_do[nctx]
+                doo.next = c_doo[nctx]
+                method.next = c_method[nctx]
+                final.next = c_final[nctx]
+                static.next = c_static[nctx]
+                maxBits.next = c_maxBits[nctx]
+                instantMaxBit.next = c_instantMaxBit[nctx]
+                d_maxBits.next = c_d_maxBits[nctx]
+                d_instantMaxBit.next = c_d_instantMaxBit[nctx]
+                code.next = c_code[nctx]
+                cur_i.next = c_cur_i[nctx]
+                length.next = c_length[nctx]
+                ibase.next = c_ibase[nctx]
+                obase.next = c_obase[nctx]
+                owide.next = c_owide[nctx]
+                o_iprogress.next = c_iprogress[nctx]
+                o_oprogress.next = c_oprogress[nctx]
+                o_done.next = c_done[nctx]
+                oaddr.next = c_oaddr[nctx]
+                obyte.next = c_obyte[nctx]
+                lwaddr.next = c_lwaddr[nctx]
+                wleaf.next = c_wleaf[nctx]
+                dlwaddr.next = c_dlwaddr[nctx]
+                dwleaf.next = c_dwleaf[nctx]
+
+                ctx.next = nctx
+                filled.next = False
+                state.next = d_state.RESTORE
+
+            if i_mode == NEXTC or i_mode == NEXTD:
+                pend.next = True
+                pend_c.next = i_mode == NEXTC
+                pend_base.next = i_waddr
+
     return instances()
 
 
 if __name__ == "__main__":
-    d = deflate(Signal(intbv()[3:]), Signal(bool(0)),
+    d = deflate(Signal(intbv()[4:]), Signal(bool(0)),
                 Signal(intbv()[8:]), Signal(intbv()[LMAX:]),
                 Signal(intbv()[LMAX:]),
                 Signal(intbv()[8:]),
-                Signal(modbv()[LIBSIZE:]), Signal(modbv()[LBSIZE:]),
-                Signal(bool(0)), ResetSignal(1, 0, True))
+                Signal(modbv()[LMAX:]), Signal(modbv()[LMAX:]),
+                Signal(bool(0)), ResetSignal(1, 0, True),
+                Signal(bool(0)), Signal(bool(0)))
     d.convert(initial_values=False)
     # VHDL output is broken
     # d.convert(initial_values=False,hdl='VHDL')
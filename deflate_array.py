@@ -0,0 +1,153 @@
+"""
+Array of MyHDL FPGA Deflate (de)compressors behind one AXI4-Stream interface
+
+Every input stream (a zlib stream) is identified by s_axis_tid and ends with
+s_axis_tlast. The first byte of a new stream id claims an idle core, the
+following bytes of that stream go to the same core. Transfers of different
+streams may be interleaved, so a slow stream does not block the others as
+long as there are idle cores.
+
+The output of all cores is merged byte by byte in round robin order, each
+byte carries the id of its stream in m_axis_tid and the last byte of a
+stream is marked with m_axis_tlast. A stream without output ends with an
+empty beat with m_axis_tlast and m_axis_tuser, see deflate_axis.
+
+Each core is a deflate_axis unit, its core is the plain deflate block.
+Set COMPRESS to False in deflate.py for a decompress only array.
+
+"""
+
+from myhdl import always, always_comb, block, Signal, intbv, instances
+
+from deflate_axis import deflate_axis
+
+NCORES = 4     # Number of cores, a power of 2
+TIDBITS = 8    # Width of the stream id
+
+
+@block
+def deflate_array(i_compress, o_busy,
+                  s_axis_tdata, s_axis_tvalid, s_axis_tready, s_axis_tlast,
+                  s_axis_tid,
+                  m_axis_tdata, m_axis_tvalid, m_axis_tready, m_axis_tlast,
+                  m_axis_tid, clk, reset, m_axis_tuser=None):
+
+    """ Multi stream AXI4-Stream Deflate (de)compress
+
+    Ports:
+
+    i_compress: compress (1) or decompress (0), sampled at the first byte
+        of a stream
+    o_busy: a core is running or its output is not drained yet
+    s_axis_tid: stream id of an input byte
+    m_axis_tid: stream id of an output byte
+    m_axis_tuser: the tlast beat of a stream without output, it has no data
+
+    """
+
+    if m_axis_tuser is None:
+        m_axis_tuser = Signal(bool(0))
+
+    if NCORES & (NCORES - 1):
+        raise ValueError("NCORES must be a power of 2")
+
+    busy = [Signal(bool(0)) for _ in range(NCORES)]
+    c_tvalid = [Signal(bool(0)) for _ in range(NCORES)]
+    c_tready = [Signal(bool(0)) for _ in range(NCORES)]
+    c_mdata = [Signal(intbv()[8:]) for _ in range(NCORES)]
+    c_mvalid = [Signal(bool(0)) for _ in range(NCORES)]
+    c_mready = [Signal(bool(0)) for _ in range(NCORES)]
+    c_mlast = [Signal(bool(0)) for _ in range(NCORES)]
+    c_muser = [Signal(bool(0)) for _ in range(NCORES)]
+
+    cores = [deflate_axis(i_compress, busy[i],
+                          s_axis_tdata, c_tvalid[i], c_tready[i],
+                          s_axis_tlast,
+                          c_mdata[i], c_mvalid[i], c_mready[i], c_mlast[i],
+                          clk, reset, c_muser[i])
+             for i in range(NCORES)]
+
+    # Stream of each core, open until its last input byte
+    owned = [Signal(bool(0)) for _ in range(NCORES)]
+    owner = [Signal(intbv(0)[TIDBITS:]) for _ in range(NCORES)]
+
+    # Core of the current input byte (hit) or an idle core (free)
+    sel = Signal(intbv(0, min=0, max=NCORES))
+    hit = Signal(bool(0))
+    free = Signal(bool(0))
+
+    # Round robin output grant
+    last = Signal(intbv(0, min=0, max=NCORES))
+    grant = Signal(intbv(0, min=0, max=NCORES))
+    granted = Signal(bool(0))
+
+    @always_comb
+    def dispatch():
+        h = False
+        f = False
+        s = 0
+        for i in range(NCORES):
+            if owned[i] and owner[i] == s_axis_tid:
+                h = True
+                s = i
+        if not h:
+            for i in range(NCORES):
+                if not f and not owned[i] and not busy[i]:
+                    f = True
+                    s = i
+        hit.next = h
+        free.next = f
+        sel.next = s
+
+    @always_comb
+    def route():
+        for i in range(NCORES):
+            c_tvalid[i].next = s_axis_tvalid and hit and sel == i
+        s_axis_tready.next = hit and c_tready[sel]
+
+    @always_comb
+    def arbiter():
+        g = False
+        s = 0
+        for j in range(NCORES):
+            i = (last + 1 + j) & (NCORES - 1)
+            if not g and c_mvalid[i]:
+                g = True
+                s = i
+        granted.next = g
+        grant.next = s
+
+    @always_comb
+    def output():
+        m_axis_tvalid.next = granted
+        m_axis_tdata.next = c_mdata[grant]
+        m_axis_tlast.next = c_mlast[grant]
+        m_axis_tuser.next = c_muser[grant]
+        m_axis_tid.next = owner[grant]
+        for i in range(NCORES):
+            c_mready[i].next = m_axis_tready and granted and grant == i
+        b = False
+        for i in range(NCORES):
+            if busy[i] or owned[i]:
+                b = True
+        o_busy.next = b
+
+    @always(clk.posedge)
+    def logic():
+        if reset:
+            for i in range(NCORES):
+                owned[i].next = False
+            last.next = 0
+        else:
+            if s_axis_tvalid and not hit and free:
+                # A new stream claims an idle core
+                owned[sel].next = True
+                owner[sel].next = s_axis_tid
+            elif s_axis_tvalid and s_axis_tready and s_axis_tlast:
+                # The core keeps the id until its output is drained
+                owned[sel].next = False
+
+            if m_axis_tvalid and m_axis_tready:
+                last.next = grant
+
+    return instances()
@@ -0,0 +1,273 @@
+"""
+AXI4-Stream wrapper for the MyHDL FPGA Deflate (de)compressor
+
+A job starts with the first input byte and its input ends with s_axis_tlast.
+Input is accepted while the deflate input buffer has free space, output is
+read as soon as the core reports it. The last output byte of a job is marked
+with m_axis_tlast, so no host polling of the progress ports is needed.
+A job without output (like decompressing an empty stream) ends with a single
+beat that has m_axis_tlast and m_axis_tuser set, its m_axis_tdata is not
+data. m_axis_tuser is low on all other beats.
+
+The input of the next job is accepted while the current job still runs or
+its output is drained, at most two jobs are in flight.
+
+Like with the bare core, compress input must be at least 4 bytes.
+
+"""
+
+from myhdl import always, always_comb, block, Signal, intbv, modbv, enum, \
+    instances
+
+import deflate as deflate_module
+from deflate import deflate, IDLE, WRITE, READ, STARTC, STARTD, NEXTC, \
+    NEXTD, LMAX
+
+# Output FIFO depth, covers the 2 cycle read latency of o_byte
+OFSIZE = 4
+
+a_state = enum('IDLE', 'CLEAR', 'START', 'SYNC', 'RUN', 'NEXT', 'WAIT')
+
+
+@block
+def deflate_axis(i_compress, o_busy,
+                 s_axis_tdata, s_axis_tvalid, s_axis_tready, s_axis_tlast,
+                 m_axis_tdata, m_axis_tvalid, m_axis_tready, m_axis_tlast,
+                 clk, reset, m_axis_tuser=None, o_ended=None):
+
+    """ AXI4-Stream Deflate (de)compress
+
+    Ports:
+
+    i_compress: compress (1) or decompress (0), sampled at the first byte
+    o_busy: a job is running or its output is not drained yet
+    m_axis_tuser: the tlast beat of a job without output, it has no data
+    o_ended: jobs whose tlast beat was taken, it wraps around
+
+    """
+
+    if m_axis_tuser is None:
+        m_axis_tuser = Signal(bool(0))
+    if o_ended is None:
+        o_ended = Signal(modbv(0)[2:])
+
+    # Number of input bytes the host may write ahead of o_iprogress.
+    # The compressor still needs the last CWINDOW bytes before o_iprogress.
+    CREDIT = deflate_module.IBSIZE - deflate_module.CWINDOW
+
+    i_mode = Signal(intbv(IDLE)[4:])
+    o_done = Signal(bool(0))
+    i_data = Signal(intbv()[8:])
+    o_byte = Signal(intbv()[8:])
+    o_iprogress = Signal(modbv()[LMAX:])
+    o_oprogress = Signal(modbv()[LMAX:])
+    i_waddr = Signal(modbv()[LMAX:])
+    i_raddr = Signal(modbv()[LMAX:])
+    i_we = Signal(bool(0))
+    i_re = Signal(bool(0))
+
+    core = deflate(i_mode, o_done, i_data, o_iprogress, o_oprogress, o_byte,
+                   i_waddr, i_raddr, clk, reset, i_we, i_re)
+
+    state = Signal(a_state.IDLE)
+    compress = Signal(bool())
+
+    wi = Signal(modbv(0)[LMAX:])  # Index of next input byte
+    ri = Signal(modbv(0)[LMAX:])  # Index of next output byte to read
+    wahead = Signal(modbv(0)[LMAX:])  # Input written after o_iprogress
+    oavail = Signal(modbv(0)[LMAX:])  # Output not read yet
+    oleft = Signal(modbv(0)[LMAX:])   # Output of the oldest finished job
+
+    # Jobs started, finished by the core and read out, the end of the
+    # output of each finished job is kept until it is read
+    started = Signal(modbv(0)[2:])
+    finished = Signal(modbv(0)[2:])
+    drained = Signal(modbv(0)[2:])
+    oend = [Signal(intbv(0)[LMAX:]) for _ in range(2)]
+    inflight = Signal(modbv(0)[2:])
+    done_d = Signal(bool(0))
+
+    # Output reads in flight: requested (rd1) and o_byte valid (rd2)
+    rd1 = Signal(bool(0))
+    rd1_last = Signal(bool(0))
+    rd1_empty = Signal(bool(0))
+    rd2 = Signal(bool(0))
+    rd2_last = Signal(bool(0))
+    rd2_empty = Signal(bool(0))
+    # The oldest job has its tlast beat in the read pipeline or the FIFO
+    sent = Signal(bool(0))
+    pending = Signal(intbv(0, min=0, max=OFSIZE + 1))
+
+    fifo = [Signal(intbv()[8:]) for _ in range(OFSIZE)]
+    fifo_last = [Signal(bool(0)) for _ in range(OFSIZE)]
+    fifo_empty = [Signal(bool(0)) for _ in range(OFSIZE)]
+    fhead = Signal(modbv(0, min=0, max=OFSIZE))
+    ftail = Signal(modbv(0, min=0, max=OFSIZE))
+    fcount = Signal(intbv(0, min=0, max=OFSIZE + 1))
+
+    @always_comb
+    def counters():
+        wahead.next = wi - o_iprogress
+        oavail.next = o_oprogress - ri
+        oleft.next = oend[drained[0]] - ri
+
+    @always_comb
+    def ready():
+        # After the decompressor is done the rest of the input is dropped
+        s_axis_tready.next = (state == a_state.RUN and
+                              (finished == started or wahead < CREDIT))
+
+    @always_comb
+    def output():
+        m_axis_tvalid.next = fcount != 0
+        m_axis_tdata.next = fifo[fhead]
+        m_axis_tlast.next = fifo_last[fhead]
+        m_axis_tuser.next = fifo_empty[fhead]
+        inflight.next = started - drained
+        o_busy.next = ((state != a_state.IDLE and state != a_state.WAIT) or
+                       started != drained or pending != 0)
+
+    @always(clk.posedge)
+    def logic():
+        if reset:
+            state.next = a_state.IDLE
+            i_mode.next = IDLE
+            i_we.next = False
+            i_re.next = False
+            rd1.next = False
+            rd2.next = False
+            sent.next = False
+            pending.next = 0
+            started.next = 0
+            finished.next = 0
+            drained.next = 0
+            o_ended.next = 0
+            done_d.next = False
+            fhead.next = 0
+            ftail.next = 0
+            fcount.next = 0
+        else:
+            i_we.next = False
+
+            if state == a_state.IDLE:
+                if s_axis_tvalid:
+                    compress.next = i_compress
+                    i_mode.next = WRITE
+                    i_waddr.next = 0
+                    i_raddr.next = 0
+                    state.next = a_state.CLEAR
+
+            elif state == a_state.CLEAR:
+                if compress:
+                    i_mode.next = STARTC
+                else:
+                    i_mode.next = STARTD
+                started.next = started + 1
+                state.next = a_state.START
+
+            elif state == a_state.START:
+                i_mode.next = READ
+                state.next = a_state.SYNC
+
+            elif state == a_state.SYNC:
+                # The core has taken the start command and cleared
+                # o_done and its progress counters
+                wi.next = 0
+                ri.next = 0
+                state.next = a_state.RUN
+
+            elif state == a_state.RUN:
+                if s_axis_tvalid and s_axis_tready:
+                    if finished != started:
+                        i_we.next = True
+                        i_waddr.next = wi
+                        i_data.next = s_axis_tdata
+                        wi.next = wi + 1
+                    if s_axis_tlast:
+                        # The last byte is written, end of input
+                        i_mode.next = IDLE
+                        state.next = a_state.WAIT
+
+            elif state == a_state.NEXT:
+                i_mode.next = READ
+                state.next = a_state.RUN
+
+            elif state == a_state.WAIT:
+                if started == drained and finished == started:
+                    # All output is read, restart at address 0
+                    state.next = a_state.IDLE
+                elif s_axis_tvalid and inflight < 2:
+                    # Queue the next job behind the running one
+                    compress.next = i_compress
+                    if i_compress:
+                        i_mode.next = NEXTC
+                    else:
+                        i_mode.next = NEXTD
+                    i_waddr.next = wi
+                    started.next = started + 1
+                    state.next = a_state.NEXT
+
+            # The core ends a job with o_done, also when the next job
+            # follows immediately
+            done_d.next = o_done
+            if o_done and not done_d:
+                oend[finished[0]].next = o_oprogress
+                finished.next = finished + 1
+
+            # Output, o_byte is valid 2 cycles after a read request
+            pop = fcount != 0 and m_axis_tready
+            issue = False
+            last = False
+            empty = False
+            if (state == a_state.RUN or state == a_state.NEXT or
+                    state == a_state.WAIT):
+                if drained != finished and oleft == 0 and sent:
+                    # All output of the oldest job is read
+                    drained.next = drained + 1
+                    sent.next = False
+                elif pending < OFSIZE:
+                    # Hold back the last byte until we know it is the last one
+                    if drained != finished:
+                        issue = True
+                        last = oleft <= 1
+                        # A job without output gets an empty tlast beat
+                        empty = oleft == 0
+                        sent.next = last
+                    else:
+                        issue = oavail > 1
+
+            if issue:
+                i_re.next = not empty
+                i_raddr.next = ri
+                if not empty:
+                    ri.next = ri + 1
+                rd1_last.next = last
+                rd1_empty.next = empty
+            else:
+                i_re.next = False
+            rd1.next = issue
+            rd2.next = rd1
+            rd2_last.next = rd1_last
+            rd2_empty.next = rd1_empty
+
+            if rd2:
+                fifo[ftail].next = o_byte
+                fifo_last[ftail].next = rd2_last
+                fifo_empty[ftail].next = rd2_empty
+                ftail.next = ftail + 1
+            if pop:
+                fhead.next = fhead + 1
+                if fifo_last[fhead]:
+                    o_ended.next = o_ended + 1
+
+            if rd2 and not pop:
+                fcount.next = fcount + 1
+            elif pop and not rd2:
+                fcount.next = fcount - 1
+
+            if issue and not pop:
+                pending.next = pending + 1
+            elif pop and not issue:
+                pending.next = pending - 1
+
+    return instances()
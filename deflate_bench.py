@@ -0,0 +1,140 @@
+"""
+Benchmark of the MyHDL FPGA Deflate core on the local corpus
+
+For each configuration (flags of the deflate module, set with configure()),
+corpus kind and size it runs a compress and a decompress job on the core of
+deflate_zlib and reports the search window CWINDOW of the configuration, the
+cycles per byte and the input stall cycles of each job, the size of the core
+output relative to zlib levels 1, 6 and 9 and whether the core at --mhz is
+faster than zlib level 6 on this machine. That compares the simulated cycles
+of the core, divided by --mhz, with the wall-clock time of host zlib, no
+hardware is timed. A summary gives the size range where the core is faster.
+
+    python deflate_bench.py [--verilator] [--mhz 100] [--sizes 256,1024]
+                            [--kinds text,json] [--configs fast,serial]
+
+"""
+
+import argparse
+import time
+import zlib
+from collections import namedtuple
+
+import deflate as deflate_module
+from deflate import STARTC, STARTD
+import deflate_zlib
+from deflate_corpus import corpus, KINDS
+
+# Flags of the deflate module per configuration
+CONFIGS = dict(fast=dict(),
+               fastpipe=dict(FASTPIPE=True),
+               serial=dict(FAST=False),
+               slots4=dict(FAST=False, SLOTS=4))
+
+Result = namedtuple('Result', 'config window kind size ccycles cstalls '
+                   'dcycles dstalls ratios cfaster dfaster')
+
+
+def seconds(f, data):
+    """ Time of f(data) on this machine """
+    n = 1
+    while True:
+        t = time.perf_counter()
+        for _ in range(n):
+            f(data)
+        t = time.perf_counter() - t
+        if t > 0.05:
+            return t / n
+        n *= 10
+
+
+def job(mode, data):
+    """ Output and Job of a job of the core """
+    out = deflate_zlib.run(mode, data)
+    return out, deflate_zlib.jobs[-1]
+
+
+def bench(config, kind, size, mhz=100):
+    """ The Result of config on size bytes of kind """
+
+    data = corpus(kind, size)
+    saved = deflate_module.configure(**CONFIGS[config])
+    try:
+        window = deflate_module.CWINDOW
+        out, c = job(STARTC, data)
+        # The flags of the configuration, not those at import time
+        wbits = deflate_module.LOBSIZE
+        if not deflate_module.DYNAMIC:
+            co = zlib.compressobj(strategy=zlib.Z_FIXED, wbits=wbits)
+        else:
+            co = zlib.compressobj(wbits=wbits)
+        zl = co.compress(data) + co.flush()
+        inflated, d = job(STARTD, zl)
+    finally:
+        deflate_module.configure(**saved)
+    if zlib.decompress(out) != data or inflated != data:
+        raise deflate_zlib.error("%s %s %d: wrong output" %
+                                 (config, kind, size))
+
+    ratios = [len(out) / len(zlib.compress(data, level))
+              for level in (1, 6, 9)]
+    hz = mhz * 1e6
+    cfaster = c.cycles / hz < seconds(lambda d: zlib.compress(d, 6), data)
+    dfaster = d.cycles / hz < seconds(zlib.decompress, zl)
+    return Result(config, window, kind, size, c.cycles / size, c.stalls,
+                  d.cycles / size, d.stalls, ratios, cfaster, dfaster)
+
+
+def faster(results, key):
+    """ The size range where key holds, as text """
+    sizes = [r.size for r in results if getattr(r, key)]
+    if not sizes:
+        return "never"
+    return "%d .. %d bytes" % (min(sizes), max(sizes))
+
+
+def report(configs, kinds, sizes, mhz=100):
+    """ Print a line per result and a summary, return the results """
+
+    print("%-8s %6s %-6s %6s %7s %6s %7s %6s %6s %6s %6s %s" % (
+        "config", "window", "kind", "size", "c cyc/B", "stall", "d cyc/B",
+        "stall", "/zl1", "/zl6", "/zl9", "faster"))
+    results = []
+    for config in configs:
+        for kind in kinds:
+            for size in sizes:
+                r = bench(config, kind, size, mhz)
+                results.append(r)
+                print("%-8s %6d %-6s %6d %7.2f %6d %7.2f %6d %6.2f %6.2f "
+                      "%6.2f %s%s" % (r.config, r.window, r.kind, r.size,
+                                      r.ccycles, r.cstalls, r.dcycles,
+                                      r.dstalls, *r.ratios,
+                                      "C" if r.cfaster else "",
+                                      "D" if r.dfaster else ""))
+    print()
+    print("Core cycles at %g MHz against the wall-clock time of zlib level 6 "
+          "on this host," % mhz)
+    print("the core is estimated faster for:")
+    for config in configs:
+        for kind in kinds:
+            rs = [r for r in results if r.config == config and r.kind == kind]
+            print("%-8s %-6s compress %s, decompress %s" % (
+                config, kind, faster(rs, 'cfaster'), faster(rs, 'dfaster')))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--verilator", action="store_true",
+                        help="run the Verilator model of the core")
+    parser.add_argument("--mhz", type=float, default=100,
+                        help="clock of the core")
+    parser.add_argument("--sizes", default="256,1024,4096")
+    parser.add_argument("--kinds", default=",".join(KINDS))
+    parser.add_argument("--configs", default=",".join(CONFIGS))
+    args = parser.parse_args()
+    if args.verilator:
+        import deflate_verilator
+        deflate_zlib.CORE = deflate_verilator.deflate
+    report(args.configs.split(","), args.kinds.split(","),
+           [int(s) for s in args.sizes.split(",")], args.mhz)
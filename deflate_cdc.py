@@ -0,0 +1,245 @@
+"""
+Separate I/O and core clocks for the AXI4-Stream MyHDL FPGA Deflate
+
+deflate_axis runs on the core clock, the host side of both streams runs on
+the I/O (bus) clock, so the core can run at its own Fmax. Each stream
+crosses through an asynchronous FIFO with gray coded pointers that are
+synchronized with 2 flip-flops. The last byte of each output stream keeps
+its tlast and tuser through the output FIFO.
+
+o_busy is high from the first input byte of a job until the output FIFO is
+empty and deflate_axis has ended every started job. The jobs are started
+on the I/O clock, the count of ended jobs is passed from the core clock as
+a gray code through 3 flip-flops, one more than the FIFO pointers, so the
+last beat of a job is in the output FIFO before its end is seen.
+
+The clocks may have any ratio. Each clock domain has its own reset
+synchronizer, reset is asserted at once and released 2 cycles later.
+
+"""
+
+from myhdl import always, always_comb, block, Signal, intbv, modbv, \
+    concat, instances
+
+from deflate_axis import deflate_axis
+
+AFSIZE = 16  # Depth of the FIFOs, a power of 2
+
+# Width of the job counters. A job that has not ended has a byte in the
+# input FIFO or is one of the (at most 3) jobs in deflate_axis, so less than
+# 2 * AFSIZE jobs are counted.
+JOBBITS = len(bin(AFSIZE)) - 1
+
+
+@block
+def rsync(o_reset, clk, reset):
+
+    """ Reset of the clk domain, asserted with reset and released after 2
+    rising edges of clk """
+
+    r1 = Signal(bool(1))
+
+    @always(clk.posedge, reset.posedge)
+    def logic():
+        if reset:
+            r1.next = True
+            o_reset.next = True
+        else:
+            r1.next = False
+            o_reset.next = r1
+
+    return logic
+
+
+@block
+def afifo(i_data, i_we, o_full, w_clk, w_reset,
+          o_data, i_re, o_empty, r_clk, r_reset):
+
+    """ Asynchronous first word fall through FIFO
+
+    Ports:
+
+    i_data, i_we, o_full: write side, on w_clk and w_reset
+    o_data, i_re, o_empty: read side, on r_clk and r_reset, o_data is valid
+        when not o_empty and i_re takes it
+
+    """
+
+    if AFSIZE & (AFSIZE - 1):
+        raise ValueError("AFSIZE must be a power of 2")
+    AW = len(bin(AFSIZE)) - 3
+    AMASK = AFSIZE - 1
+    PMASK = 2 * AFSIZE - 1
+    TOP = 3 << (AW - 1)
+
+    mem = [Signal(intbv(0)[len(i_data):]) for _ in range(AFSIZE)]
+
+    # Binary and gray pointers, one bit wider than the address
+    wbin = Signal(modbv(0)[AW + 1:])
+    wgray = Signal(modbv(0)[AW + 1:])
+    rbin = Signal(modbv(0)[AW + 1:])
+    rgray = Signal(modbv(0)[AW + 1:])
+
+    # Pointers of the other side, synchronized
+    rq1 = Signal(modbv(0)[AW + 1:])
+    rq2 = Signal(modbv(0)[AW + 1:])
+    wq1 = Signal(modbv(0)[AW + 1:])
+    wq2 = Signal(modbv(0)[AW + 1:])
+
+    @always_comb
+    def flags():
+        o_full.next = w_reset or wgray == rq2 ^ TOP
+        o_empty.next = r_reset or rgray == wq2
+        o_data.next = mem[rbin & AMASK]
+
+    @always(w_clk.posedge)
+    def wlogic():
+        if w_reset:
+            wbin.next = 0
+            wgray.next = 0
+            rq1.next = 0
+            rq2.next = 0
+        else:
+            rq1.next = rgray
+            rq2.next = rq1
+            if i_we and not o_full:
+                mem[wbin & AMASK].next = i_data
+                wnext = (wbin + 1) & PMASK
+                wbin.next = wnext
+                wgray.next = wnext ^ (wnext >> 1)
+
+    @always(r_clk.posedge)
+    def rlogic():
+        if r_reset:
+            rbin.next = 0
+            rgray.next = 0
+            wq1.next = 0
+            wq2.next = 0
+        else:
+            wq1.next = wgray
+            wq2.next = wq1
+            if i_re and not o_empty:
+                rnext = (rbin + 1) & PMASK
+                rbin.next = rnext
+                rgray.next = rnext ^ (rnext >> 1)
+
+    return instances()
+
+
+@block
+def deflate_cdc(i_compress, o_busy,
+                s_axis_tdata, s_axis_tvalid, s_axis_tready, s_axis_tlast,
+                m_axis_tdata, m_axis_tvalid, m_axis_tready, m_axis_tlast,
+                clk, core_clk, reset, m_axis_tuser=None):
+
+    """ AXI4-Stream Deflate (de)compress with a separate core clock
+
+    Ports:
+
+    clk: I/O clock of both streams, i_compress and o_busy
+    core_clk: clock of the deflate core
+
+    The other ports are those of deflate_axis.
+
+    """
+
+    if m_axis_tuser is None:
+        m_axis_tuser = Signal(bool(0))
+
+    # Reset of each clock domain
+    s_reset = Signal(bool(1))
+    c_reset = Signal(bool(1))
+
+    # Input: i_compress, tlast and tdata
+    s_word = Signal(intbv(0)[10:])
+    s_full = Signal(bool(0))
+    c_sword = Signal(intbv(0)[10:])
+    c_sempty = Signal(bool(0))
+
+    c_compress = Signal(bool(0))
+    c_busy = Signal(bool(0))
+    c_tdata = Signal(intbv()[8:])
+    c_tvalid = Signal(bool(0))
+    c_tready = Signal(bool(0))
+    c_tlast = Signal(bool(0))
+
+    # Output: tuser, tlast and tdata
+    c_mdata = Signal(intbv()[8:])
+    c_mvalid = Signal(bool(0))
+    c_mready = Signal(bool(0))
+    c_mlast = Signal(bool(0))
+    c_muser = Signal(bool(0))
+    c_mword = Signal(intbv(0)[10:])
+    c_mfull = Signal(bool(0))
+    m_word = Signal(intbv(0)[10:])
+    m_empty = Signal(bool(0))
+
+    # Jobs started on the I/O clock and ended by deflate_axis
+    sfirst = Signal(bool(1))
+    started = Signal(modbv(0)[JOBBITS:])
+    sgray = Signal(modbv(0)[JOBBITS:])
+    c_ended = Signal(modbv(0)[JOBBITS:])
+    c_egray = Signal(modbv(0)[JOBBITS:])
+    eq1 = Signal(modbv(0)[JOBBITS:])
+    eq2 = Signal(modbv(0)[JOBBITS:])
+    eq3 = Signal(modbv(0)[JOBBITS:])
+
+    ssync = rsync(s_reset, clk, reset)
+    csync = rsync(c_reset, core_clk, reset)
+
+    ififo = afifo(s_word, s_axis_tvalid, s_full, clk, s_reset,
+                  c_sword, c_tready, c_sempty, core_clk, c_reset)
+
+    core = deflate_axis(c_compress, c_busy,
+                        c_tdata, c_tvalid, c_tready, c_tlast,
+                        c_mdata, c_mvalid, c_mready, c_mlast,
+                        core_clk, c_reset, c_muser, c_ended)
+
+    ofifo = afifo(c_mword, c_mvalid, c_mfull, core_clk, c_reset,
+                  m_word, m_axis_tready, m_empty, clk, s_reset)
+
+    @always_comb
+    def iside():
+        s_word.next = concat(i_compress, s_axis_tlast, s_axis_tdata)
+        s_axis_tready.next = not s_full
+        m_axis_tvalid.next = not m_empty
+        m_axis_tdata.next = m_word[8:]
+        m_axis_tlast.next = m_word[8]
+        m_axis_tuser.next = m_word[9]
+        sgray.next = started ^ (started >> 1)
+        o_busy.next = sgray != eq3 or not m_empty
+
+    @always_comb
+    def cside():
+        c_compress.next = c_sword[9]
+        c_tlast.next = c_sword[8]
+        c_tdata.next = c_sword[8:]
+        c_tvalid.next = not c_sempty
+        c_mword.next = concat(c_muser, c_mlast, c_mdata)
+        c_mready.next = not c_mfull
+
+    @always(core_clk.posedge)
+    def cjobs():
+        if c_reset:
+            c_egray.next = 0
+        else:
+            c_egray.next = c_ended ^ (c_ended >> 1)
+
+    @always(clk.posedge)
+    def busy():
+        if s_reset:
+            sfirst.next = True
+            started.next = 0
+            eq1.next = 0
+            eq2.next = 0
+            eq3.next = 0
+        else:
+            eq1.next = c_egray
+            eq2.next = eq1
+            eq3.next = eq2
+            if s_axis_tvalid and not s_full:
+                sfirst.next = s_axis_tlast
+                if sfirst:
+                    started.next = started + 1
+
+    return instances()
@@ -0,0 +1,98 @@
+"""
+Local benchmark corpus for the MyHDL FPGA Deflate core
+
+corpus(kind, size) generates size bytes of a kind from a fixed seed, so the
+data is the same on every machine and needs no network:
+
+text: English like words and sentences
+log: web server log lines
+json: an array of JSON records
+html: a page of markup
+binary: little endian records of integers and floats
+random: random bytes, does not compress
+runs: long runs of a few byte values
+mix: the other kinds in turns, like a file set of the Canterbury corpus
+
+"""
+
+import json
+import random
+import struct
+
+KINDS = ('text', 'log', 'json', 'html', 'binary', 'random', 'runs', 'mix')
+
+WORDS = ("the of and to in is that it was for on are as with his they at be "
+         "this from have or by one had not but what all were when we there "
+         "can an your which their said if do will each about how up out "
+         "them then she many some so these would other into has more her "
+         "two like him see time could no make than first been its who now "
+         "people my made over did down only way find use may water long "
+         "little very after words called just where most know deflate "
+         "block window match literal distance length huffman tree").split()
+
+
+def text(r):
+    words = [r.choice(WORDS) for _ in range(r.randrange(4, 16))]
+    return " ".join(words).capitalize() + r.choice(".,.!?") + " "
+
+
+def log(r):
+    path = "/".join(r.choice(WORDS) for _ in range(r.randrange(1, 4)))
+    return '10.0.%d.%d - - [19/Oct/2026:%02d:%02d:%02d +0000] ' \
+        '"%s /%s HTTP/1.1" %d %d\n' % (
+            r.randrange(4), r.randrange(256), r.randrange(24),
+            r.randrange(60), r.randrange(60),
+            r.choice(("GET", "GET", "POST")), path,
+            r.choice((200, 200, 200, 304, 404)), r.randrange(100, 20000))
+
+
+def record(r):
+    return json.dumps(dict(id=r.randrange(100000), name=r.choice(WORDS),
+                           tags=[r.choice(WORDS) for _ in range(3)],
+                           size=r.randrange(1 << 16),
+                           ratio=round(r.random(), 3),
+                           valid=r.random() < 0.8)) + ",\n"
+
+
+def html(r):
+    tag = r.choice(("p", "li", "td", "h2"))
+    return '<%s class="%s"><a href="/%s">%s</a> %s</%s>\n' % (
+        tag, r.choice(WORDS), r.choice(WORDS), r.choice(WORDS),
+        text(r), tag)
+
+
+def binary(r):
+    return struct.pack('<IHhf', r.randrange(1 << 20), r.randrange(1 << 16),
+                       r.randrange(-100, 100), r.gauss(0, 1000))
+
+
+def rand(r):
+    return bytes(r.randrange(256) for _ in range(64))
+
+
+def runs(r):
+    return bytes([r.choice(b"\x00\x00\xff A")]) * r.randrange(1, 200)
+
+
+PARTS = dict(text=text, log=log, json=record, html=html, binary=binary,
+             random=rand, runs=runs)
+
+HEAD = dict(json="[\n", html="<html><body>\n")
+
+
+def corpus(kind, size, seed=1):
+    """ size bytes of kind """
+
+    if kind not in KINDS:
+        raise ValueError("unknown corpus kind %s" % kind)
+    r = random.Random(seed)
+    out = bytearray(HEAD.get(kind, "").encode())
+    while len(out) < size:
+        if kind == 'mix':
+            part = corpus(r.choice(KINDS[:-1]), 1024, r.randrange(1 << 30))
+        else:
+            part = PARTS[kind](r)
+        if isinstance(part, str):
+            part = part.encode()
+        out += part
+    return bytes(out[:size])
@@ -0,0 +1,336 @@
+"""
+Wishbone DMA front end for the MyHDL FPGA Deflate (de)compressor
+
+The engine works through a ring of job descriptors in memory. For each job it
+fetches the source buffer in bursts, streams it through deflate_axis and
+writes the result back, without per byte CPU involvement.
+
+The bus is a 32 bit pipelined Wishbone (B4) master with word addresses.
+Buffers and the descriptor ring must be 4 byte aligned.
+
+Descriptor (4 words):
+
+    0: source byte address
+    1: source length in bytes
+    2: destination byte address
+    3: control, bit 24 set means compress
+
+When a job is done the engine writes DONE (bit 31) | bit 24 | output length
+to the control word, advances TAIL and pulses o_irq. The output length has
+lenbits (24) bits, from LENGTH + 1 bytes on it stays at LENGTH and OVERFLOW
+(bit 30) is set. The output is written in full, its end is then up to the host.
+
+Registers:
+
+    0: BASE  word address of the descriptor ring
+    1: SIZE  number of descriptors in the ring
+    2: HEAD  index of the next free descriptor, written by the host
+    3: TAIL  index of the next descriptor to process (read only)
+
+"""
+
+from myhdl import always, always_comb, block, Signal, intbv, modbv, enum, \
+    instances
+
+from deflate_axis import deflate_axis
+
+BASE, SIZE, HEAD, TAIL = range(4)
+
+DONE = 1 << 31
+OVERFLOW = 1 << 30
+COMPRESS_BIT = 1 << 24
+LENGTH = COMPRESS_BIT - 1  # Largest output length in the status
+
+AW = 30         # Word address width
+BURST = 4       # Words per burst
+IFSIZE = 8      # Input word FIFO
+OFSIZE = 8      # Output word FIFO
+
+d_state = enum('IDLE', 'DESC', 'RUN', 'STATUS', 'IRQ')
+b_kind = enum('DESC', 'SRC', 'DST', 'STATUS')
+
+
+@block
+def deflate_dma(i_reg_addr, i_reg_we, i_reg_wdata, o_reg_rdata, o_irq,
+                o_wb_cyc, o_wb_stb, o_wb_we, o_wb_adr, o_wb_dat, o_wb_sel,
+                i_wb_dat, i_wb_ack, i_wb_stall, clk, reset, lenbits=24):
+
+    """ Deflate DMA engine
+
+    Ports:
+
+    i_reg_*, o_reg_rdata: register port, see the module documentation
+    o_irq: one cycle pulse for every finished descriptor
+    o_wb_*, i_wb_*: Wishbone master
+    lenbits: width of the output length in the status, at most 24
+
+    """
+
+    if not 0 < lenbits <= 24:
+        raise ValueError("lenbits must be 1 to 24")
+    MAXLEN = (1 << lenbits) - 1  # LENGTH for the default width
+
+    i_compress = Signal(bool(0))
+    o_busy = Signal(bool(0))
+    s_tdata = Signal(intbv()[8:])
+    s_tvalid = Signal(bool(0))
+    s_tready = Signal(bool(0))
+    s_tlast = Signal(bool(0))
+    m_tdata = Signal(intbv()[8:])
+    m_tvalid = Signal(bool(0))
+    m_tready = Signal(bool(0))
+    m_tlast = Signal(bool(0))
+    m_tuser = Signal(bool(0))
+
+    axis = deflate_axis(i_compress, o_busy,
+                        s_tdata, s_tvalid, s_tready, s_tlast,
+                        m_tdata, m_tvalid, m_tready, m_tlast, clk, reset,
+                        m_tuser)
+
+    base = Signal(intbv(0)[AW:])
+    size = Signal(intbv(0)[16:])
+    head = Signal(intbv(0)[16:])
+    tail = Signal(intbv(0)[16:])
+
+    state = Signal(d_state.IDLE)
+    desc = Signal(intbv(0)[AW:])      # Word address of current descriptor
+    src = Signal(intbv(0)[AW:])
+    dst = Signal(intbv(0)[AW:])
+    fetch_left = Signal(intbv(0)[32:])  # Source bytes still to fetch
+    send_left = Signal(intbv(0)[32:])   # Source bytes still to send
+    outlen = Signal(intbv(0, min=0, max=MAXLEN + 2))  # Saturates
+    status = Signal(intbv(0)[32:])  # Output length and OVERFLOW
+    out_end = Signal(bool(0))
+
+    # Bus transaction: issued and acknowledged words
+    bus = Signal(bool(0))
+    bkind = Signal(b_kind.DESC)
+    badr = Signal(intbv(0)[AW:])
+    bissue = Signal(intbv(0, min=0, max=BURST + 1))
+    back = Signal(intbv(0, min=0, max=BURST + 1))
+    bidx = Signal(intbv(0, min=0, max=5))
+
+    ififo = [Signal(intbv(0)[32:]) for _ in range(IFSIZE)]
+    ihead = Signal(modbv(0, min=0, max=IFSIZE))
+    itail = Signal(modbv(0, min=0, max=IFSIZE))
+    icount = Signal(intbv(0, min=0, max=IFSIZE + 1))
+    ilane = Signal(modbv(0)[2:])
+
+    ofifo = [Signal(intbv(0)[32:]) for _ in range(OFSIZE)]
+    osel = [Signal(intbv(0)[4:]) for _ in range(OFSIZE)]
+    ohead = Signal(modbv(0, min=0, max=OFSIZE))
+    otail = Signal(modbv(0, min=0, max=OFSIZE))
+    ocount = Signal(intbv(0, min=0, max=OFSIZE + 1))
+    olane = Signal(modbv(0)[2:])
+    oword = Signal(intbv(0)[32:])
+
+    @always_comb
+    def streams():
+        iword = ififo[ihead]
+        s_tvalid.next = (state == d_state.RUN and icount != 0 and
+                         send_left != 0)
+        s_tdata.next = (iword >> (8 * ilane)) & 0xFF
+        s_tlast.next = send_left == 1
+        m_tready.next = state == d_state.RUN and ocount < OFSIZE
+
+    @always_comb
+    def length():
+        if outlen > MAXLEN:
+            status.next = MAXLEN | OVERFLOW
+        else:
+            status.next = outlen
+
+    @always_comb
+    def wishbone():
+        o_wb_cyc.next = bus
+        o_wb_stb.next = bus and bissue != 0
+        o_wb_we.next = bkind == b_kind.DST or bkind == b_kind.STATUS
+        o_wb_adr.next = badr
+        o_wb_sel.next = 0xF
+        o_wb_dat.next = status | DONE
+        if bkind == b_kind.DST:
+            o_wb_sel.next = osel[ohead]
+            o_wb_dat.next = ofifo[ohead]
+        elif bkind == b_kind.STATUS and i_compress:
+            o_wb_dat.next = status | DONE | COMPRESS_BIT
+
+    @always_comb
+    def registers():
+        if i_reg_addr == BASE:
+            o_reg_rdata.next = base
+        elif i_reg_addr == SIZE:
+            o_reg_rdata.next = size
+        elif i_reg_addr == HEAD:
+            o_reg_rdata.next = head
+        else:
+            o_reg_rdata.next = tail
+
+    @always(clk.posedge)
+    def logic():
+        if reset:
+            state.next = d_state.IDLE
+            head.next = 0
+            tail.next = 0
+            bus.next = False
+            o_irq.next = False
+            icount.next = 0
+            ihead.next = 0
+            itail.next = 0
+            ocount.next = 0
+            ohead.next = 0
+            otail.next = 0
+        else:
+            o_irq.next = False
+
+            if i_reg_we:
+                if i_reg_addr == BASE:
+                    base.next = i_reg_wdata[AW:]
+                elif i_reg_addr == SIZE:
+                    size.next = i_reg_wdata[16:]
+                elif i_reg_addr == HEAD:
+                    head.next = i_reg_wdata[16:]
+
+            ipush = False
+            ipop = False
+            opush = False
+            opop = False
+
+            # Bus transactions
+            if bus:
+                if bissue != 0 and not i_wb_stall:
+                    badr.next = badr + 1
+                    bissue.next = bissue - 1
+                    if bkind == b_kind.DST:
+                        opop = True
+                if i_wb_ack:
+                    if bkind == b_kind.DESC:
+                        if bidx == 0:
+                            src.next = i_wb_dat[32:2]
+                        elif bidx == 1:
+                            fetch_left.next = i_wb_dat
+                            send_left.next = i_wb_dat
+                        elif bidx == 2:
+                            dst.next = i_wb_dat[32:2]
+                        else:
+                            i_compress.next = (i_wb_dat & COMPRESS_BIT) != 0
+                        bidx.next = bidx + 1
+                    elif bkind == b_kind.SRC:
+                        ipush = True
+                    back.next = back - 1
+                    if back == 1:
+                        bus.next = False
+            elif state == d_state.DESC:
+                bus.next = True
+                bkind.next = b_kind.DESC
+                badr.next = desc
+                bissue.next = 4
+                back.next = 4
+                bidx.next = 0
+                state.next = d_state.RUN
+            elif state == d_state.RUN:
+                if ocount >= BURST or (out_end and ocount != 0):
+                    n = BURST
+                    if ocount < BURST:
+                        n = int(ocount)
+                    bus.next = True
+                    bkind.next = b_kind.DST
+                    badr.next = dst
+                    dst.next = dst + n
+                    bissue.next = n
+                    back.next = n
+                elif fetch_left != 0 and icount <= IFSIZE - BURST:
+                    # Fetch the rest of the source, at most a burst
+                    n = BURST
+                    if fetch_left <= 4 * BURST:
+                        n = int((fetch_left + 3) >> 2)
+                        fetch_left.next = 0
+                    else:
+                        fetch_left.next = fetch_left - 4 * BURST
+                    bus.next = True
+                    bkind.next = b_kind.SRC
+                    badr.next = src
+                    src.next = src + n
+                    bissue.next = n
+                    back.next = n
+                elif out_end and ocount == 0:
+                    bus.next = True
+                    bkind.next = b_kind.STATUS
+                    badr.next = desc + 3
+                    bissue.next = 1
+                    back.next = 1
+                    state.next = d_state.STATUS
+            elif state == d_state.STATUS:
+                o_irq.next = True
+                if tail + 1 == size:
+                    tail.next = 0
+                else:
+                    tail.next = tail + 1
+                state.next = d_state.IRQ
+            elif state == d_state.IRQ:
+                # Wait for the new TAIL
+                state.next = d_state.IDLE
+            elif state == d_state.IDLE and tail != head:
+                desc.next = base + (tail << 2)
+                outlen.next = 0
+                olane.next = 0
+                oword.next = 0
+                ilane.next = 0
+                out_end.next = False
+                state.next = d_state.DESC
+
+            # Source bytes to the core
+            if s_tvalid and s_tready:
+                send_left.next = send_left - 1
+                ilane.next = ilane + 1
+                if ilane == 3 or s_tlast:
+                    ilane.next = 0
+                    ipop = True
+
+            # Core output bytes to destination words
+            if m_tvalid and m_tready and m_tuser:
+                # The empty beat of a job without output
+                out_end.next = True
+            elif m_tvalid and m_tready:
+                if outlen <= MAXLEN:
+                    outlen.next = outlen + 1
+                word = oword | (m_tdata << (8 * olane))
+                oword.next = word
+                olane.next = olane + 1
+                if olane == 3 or m_tlast:
+                    ofifo[otail].next = word
+                    osel[otail].next = (1 << (olane + 1)) - 1
+                    otail.next = otail + 1
+                    oword.next = 0
+                    olane.next = 0
+                    opush = True
+                if m_tlast:
+                    out_end.next = True
+            elif (state == d_state.RUN and send_left == 0 and
+                    not o_busy and not bus):
+                # Done without tlast
+                if olane != 0:
+                    ofifo[otail].next = oword
+                    osel[otail].next = (1 << olane) - 1
+                    otail.next = otail + 1
+                    olane.next = 0
+                    opush = True
+                out_end.next = True
+
+            if ipush:
+                ififo[itail].next = i_wb_dat
+                itail.next = itail + 1
+            if ipop:
+                ihead.next = ihead + 1
+            if ipush and not ipop:
+                icount.next = icount + 1
+            elif ipop and not ipush:
+                icount.next = icount - 1
+
+            if opop:
+                ohead.next = ohead + 1
+            if opush and not opop:
+                ocount.next = ocount + 1
+            elif opop and not opush:
+                ocount.next = ocount - 1
+
+    return instances()
@@ -0,0 +1,192 @@
+"""
+Transaction level host for the MyHDL FPGA Deflate core
+
+A DeflateDriver drives the I/O ports of one core, the MyHDL deflate(), the
+Verilator model of deflate_verilator or a Cosimulation. Its compress() and
+decompress() are coroutines for a MyHDL instance:
+
+    driver = DeflateDriver(clk, i_mode=i_mode, o_done=o_done, ...)
+
+    @instance
+    def host():
+        out = yield from driver.compress(data)
+
+The testbench drives clk and reset. The driver acts on the falling edge of
+clk, it writes input with i_we as long as the core has room and reads the
+output with i_re in the same cycles. Each job is recorded in jobs.
+
+stream() runs a job on a Feed whose input may still grow: the job keeps
+i_mode at READ and waits for more input until the host sets end. With the
+o_wait port of the core the feed tells when the job needs more input.
+
+A job needs input, and compress input of at least MINSIZE bytes, else it
+raises ValueError.
+
+"""
+
+from collections import namedtuple
+
+from myhdl import Error
+
+import deflate as core
+from deflate import IDLE, READ, STARTC, STARTD
+
+MINSIZE = 5  # The compressor does not start on shorter input
+
+# Default timeout of a job, cycles per input byte and a fixed part. A byte
+# inflates to at most 1032 bytes.
+TIMEOUT_BYTE = 4096
+TIMEOUT_JOB = 10000
+
+
+class Job(namedtuple('Job', 'mode isize osize cycles stalls')):
+
+    """ A job: input and output bytes, its cycles and the cycles that input
+    waited for room in the core """
+
+    @property
+    def throughput(self):
+        """ Uncompressed bytes per cycle """
+        size = self.isize if self.mode == STARTC else self.osize
+        return size / self.cycles
+
+
+class Feed:
+
+    """ Input and output of a streamed job. The host appends input to data
+    and sets end after the last byte, the driver appends the output to out.
+
+    written: input bytes written to the core
+    starved: all input is written and the job waits for more
+    iend: o_iprogress at the end of the job
+
+    """
+
+    def __init__(self, data=b'', end=False):
+        self.data = bytearray(data)
+        self.end = end
+        self.written = 0
+        self.out = bytearray()
+        self.starved = False
+        self.iend = None
+
+
+class DeflateDriver:
+
+    """ Host of a core with i_we and i_re, clk is driven by the testbench
+
+    ahead: input bytes the host may write beyond o_iprogress, None is
+        IBSIZE - CWINDOW of the current configuration
+    timeout: cycles after which a job raises Error, None is TIMEOUT_JOB
+        plus TIMEOUT_BYTE for each input byte
+    o_wait: the o_wait port of the core, for stream()
+
+    """
+
+    def __init__(self, clk, i_mode, o_done, i_data, o_iprogress, o_oprogress,
+                 o_byte, i_waddr, i_raddr, i_we, i_re, ahead=None,
+                 timeout=None, o_wait=None):
+        self.clk = clk
+        self.i_mode = i_mode
+        self.o_done = o_done
+        self.i_data = i_data
+        self.o_iprogress = o_iprogress
+        self.o_oprogress = o_oprogress
+        self.o_byte = o_byte
+        self.i_waddr = i_waddr
+        self.i_raddr = i_raddr
+        self.i_we = i_we
+        self.i_re = i_re
+        if ahead is None:
+            # The compressor still needs the last CWINDOW bytes
+            ahead = core.IBSIZE - core.CWINDOW
+        self.ahead = ahead
+        self.timeout = timeout
+        self.o_wait = o_wait
+        self.mask = (1 << len(o_oprogress)) - 1
+        self.jobs = []
+
+    def compress(self, data):
+        """ Coroutine, returns the zlib stream of data """
+        return (yield from self.job(STARTC, data))
+
+    def decompress(self, data):
+        """ Coroutine, returns the inflated zlib stream data """
+        return (yield from self.job(STARTD, data))
+
+    def job(self, mode, data):
+        """ Stream data through a job of mode, returns the output """
+
+        if not data:
+            raise ValueError("a job needs input")
+        if mode == STARTC and len(data) < MINSIZE:
+            raise ValueError("compress input must be at least %d bytes" %
+                             MINSIZE)
+        feed = Feed(data, True)
+        yield from self.stream(mode, feed)
+        return bytes(feed.out)
+
+    def stream(self, mode, feed):
+        """ Run a job of mode on the input of feed as it arrives, until the
+        core is done and its output is read """
+
+        out = feed.out
+        ri = 0
+        cycles = 0
+        stalls = 0
+        reading = False
+        quiet = 0  # Cycles since the last write, o_wait sees it after 2
+        while True:
+            yield self.clk.negedge
+            cycles += 1
+            timeout = self.timeout
+            if timeout is None:
+                timeout = TIMEOUT_JOB + TIMEOUT_BYTE * len(feed.data)
+            if cycles > timeout:
+                raise Error("deflate job timeout")
+            if reading:
+                out.append(int(self.o_byte))
+                ri += 1
+            self.i_we.next = 0
+            data = feed.data
+            wi = feed.written
+            quiet += 1
+            feed.starved = wi == len(data) and (wi == 0 or (
+                self.o_wait is not None and self.o_wait and quiet > 2 and
+                ri & self.mask == self.o_oprogress))
+            if wi == 0:
+                self.i_mode.next = IDLE
+                if data:
+                    self.i_we.next = 1
+                    self.i_waddr.next = 0
+                    self.i_data.next = data[0]
+                    feed.written = 1
+                    quiet = 0
+                continue
+            if wi == 1 and self.i_mode == IDLE:
+                self.i_mode.next = mode
+                self.i_waddr.next = 0
+                self.i_data.next = 0
+                continue
+            oprogress = int(self.o_oprogress)
+            if self.o_done and ri & self.mask == oprogress:
+                break
+            self.i_mode.next = READ
+            if wi == len(data):
+                if feed.end:
+                    self.i_mode.next = IDLE
+            elif (wi - self.o_iprogress) & self.mask < self.ahead:
+                self.i_we.next = 1
+                self.i_waddr.next = wi
+                self.i_data.next = data[wi]
+                feed.written = wi + 1
+                quiet = 0
+            else:
+                stalls += 1
+            reading = ri & self.mask != oprogress
+            self.i_re.next = reading
+            self.i_raddr.next = ri
+        feed.iend = int(self.o_iprogress)
+        self.i_mode.next = IDLE
+        self.i_re.next = 0
+        self.jobs.append(Job(mode, feed.written, len(out), cycles, stalls))
@@ -0,0 +1,393 @@
+"""
+Software model of the MyHDL FPGA Deflate core
+
+compress() makes the matches of deflate() with the FAST, MATCH10 and CWINDOW
+settings of the deflate module at the time of the call and returns the same
+bytes. decompress() inflates a zlib stream. Both also count the cycles of the
+job in each d_state, indexed like the performance counters (o_pdata) of the
+core. The count assumes that the input is always there and that the output is
+drained in time, it is an estimate for exploring settings. CBRAM, SLOTS,
+FASTPIPE and LOWLUT change the cycles of the core but not its bytes.
+
+Against deflate_zlib.run() on 3 KB and 20 KB of test_data(2) the model
+compressed 100 to 300 times and decompressed 600 to 2000 times faster than the
+simulation of the core, the ratio depends on the host and the data.
+
+"""
+
+import zlib
+
+import deflate as core
+from deflate import d_state, CopyLength, ExtraLengthBits, CopyDistance, \
+    ExtraDistanceBits, CodeLengthOrder
+
+NSTATES = len(d_state._names)
+
+# As in deflate()
+EndOfBlock = 256
+MaxBitLength = 288
+NLEAVES = 32768
+NDLEAVES = 4096
+
+
+class BitWriter:
+
+    """ LSB first bit output """
+
+    def __init__(self):
+        self.out = bytearray()
+        self.bits = 0
+        self.nbits = 0
+
+    def put(self, value, width):
+        self.bits |= value << self.nbits
+        self.nbits += width
+        while self.nbits >= 8:
+            self.out.append(self.bits & 0xFF)
+            self.bits >>= 8
+            self.nbits -= 8
+
+    def put_rev(self, code, width):
+        """ A Huffman code, MSB first """
+        r = 0
+        for _ in range(width):
+            r = (r << 1) | (code & 1)
+            code >>= 1
+        self.put(r, width)
+
+    def align(self):
+        if self.nbits:
+            self.put(0, 8 - self.nbits)
+
+
+def fixed_code(lcode):
+    """ Fixed Huffman code and length of a literal/length code """
+    if lcode < 144:
+        return 0x30 + lcode, 8
+    if lcode < 256:
+        return 0x190 + lcode - 144, 9
+    if lcode < 280:
+        return lcode - 256, 7
+    return 0xC0 + lcode - 280, 8
+
+
+def distance_code(distance):
+    """ Distance code, extra bits and their value """
+    code = 0
+    while CopyDistance[code + 1] <= distance:
+        code += 1
+    return code, ExtraDistanceBits[code // 2], distance - CopyDistance[code]
+
+
+def matches(data):
+    """ The literals (length 0) and matches (length, distance) of the core
+
+    The search takes the nearest match of 3 bytes in the window and extends
+    it up to 5 (10 with MATCH10) bytes. A match of length L needs L + 2
+    bytes from its start to the end of the input.
+
+    """
+
+    rmax = 10 if core.MATCH10 else 5
+    window = core.CWINDOW
+    n = len(data)
+    di = 0
+    while di < n:
+        found = 0
+        if n - di >= 5:
+            for distance in range(1, min(window, di) + 1):
+                s = di - distance
+                if data[s:s + 3] == data[di:di + 3]:
+                    found = distance
+                    break
+        if not found:
+            yield data[di], 0, 0
+            di += 1
+            continue
+        length = 3
+        s = di - found
+        while length < rmax and n - di >= length + 3 and \
+                data[s + length] == data[di + length]:
+            length += 1
+        yield data[di], length, found
+        di += length
+
+
+def compress(data):
+    """ zlib stream of data and the cycles per d_state """
+
+    cycles = [0] * NSTATES
+    CSTATIC, SEARCH, SEARCHF, SEARCH10, DISTANCE, CHECKSUM = [
+        int(s) for s in (d_state.CSTATIC, d_state.SEARCH, d_state.SEARCHF,
+                         d_state.SEARCH10, d_state.DISTANCE, d_state.CHECKSUM)]
+    fast = core.FAST
+    rmax = 10 if core.MATCH10 else 5
+    n = len(data)
+    w = BitWriter()
+    w.out += b'\x78\x9c'
+    w.put(0x3, 3)
+    # Header, end of block, checksum and the start of the job
+    cycles[CSTATIC] += 17
+    cycles[int(d_state.IDLE)] += 1
+    di = 0
+    # Cycles since di moved, the bytes behind b4 load one per cycle
+    since = 0
+    flush = False
+    for byte, length, distance in matches(data):
+        # A put that fills a byte costs a flush cycle in CSTATIC or DISTANCE
+        c = (1 if fast else 2) + flush
+        cycles[CSTATIC] += c
+        since += c
+        if not length:
+            w.put_rev(*fixed_code(byte))
+            flush = w.nbits == 0
+            if di == 0 or n - di < 5:
+                cycles[SEARCH] += 1
+            elif fast:
+                cycles[SEARCH] += 2
+            else:
+                cycles[SEARCH] += min(core.CWINDOW, di) + 1
+            di += 1
+            since = 0
+            continue
+        if fast:
+            cycles[SEARCH] += 1
+            # b5 and up, up to the first mismatch
+            need = 0
+            if length > 3:
+                need = length + (length < rmax)
+            cycles[SEARCHF] += 1 + max(0, need - since - 4)
+        else:
+            cycles[SEARCH] += distance
+            cycles[SEARCH10] += length - 2
+        w.put_rev(*fixed_code(length + 254))
+        c = 1 + (w.nbits == 0)
+        code, extra, value = distance_code(distance)
+        c += code + 1
+        w.put_rev(code, 5)
+        if extra > 4:
+            w.put(value & 0x7, 3)
+            c += 1 + (w.nbits == 0)
+            w.put(value >> 3, extra - 3)
+        else:
+            w.put(value, extra)
+        flush = w.nbits == 0
+        cycles[DISTANCE] += c
+        cycles[CHECKSUM] += length
+        di += length
+        since = c + length
+    w.put_rev(*fixed_code(EndOfBlock))
+    w.align()
+    w.out += zlib.adler32(data).to_bytes(4, 'big')
+    return bytes(w.out), cycles
+
+
+class BitReader:
+
+    """ LSB first bit input, counts the moves of the byte address """
+
+    def __init__(self, data, pos):
+        self.data = data
+        self.pos = pos * 8
+        self.moved = False
+
+    def peek(self, width):
+        v = int.from_bytes(self.data[self.pos >> 3:(self.pos >> 3) + 4],
+                           'little')
+        return (v >> (self.pos & 7)) & ((1 << width) - 1)
+
+    def get(self, width):
+        v = self.peek(width)
+        self.adv(width)
+        return v
+
+    def adv(self, width):
+        if (self.pos & 7) + width >= 8:
+            self.moved = True
+        self.pos += width
+
+    def code(self, table):
+        """ Next Huffman code of table (code, length) -> symbol """
+        code = 0
+        for length in range(1, 16):
+            code = (code << 1) | self.get(1)
+            if (code, length) in table:
+                return table[code, length], length
+        raise ValueError("invalid Huffman code")
+
+
+def huffman(lengths):
+    """ Canonical Huffman table (code, length) -> symbol """
+    count = [0] * 16
+    for n in lengths:
+        count[n] += 1
+    count[0] = 0
+    code = 0
+    first = [0] * 16
+    for n in range(1, 16):
+        code = (code + count[n - 1]) << 1
+        first[n] = code
+    table = {}
+    for symbol, n in enumerate(lengths):
+        if n:
+            table[first[n], n] = symbol
+            first[n] += 1
+    return table
+
+
+def tree_cycles(cycles, lengths, nleaves, imb):
+    """ Count the cycles to build the leaves of a tree, return its imb """
+
+    HF1, HF1INIT, HF2, HF3, HF4, HF4_2, HF4_3, SPREAD = [
+        int(s) for s in (d_state.HF1, d_state.HF1INIT, d_state.HF2,
+                         d_state.HF3, d_state.HF4, d_state.HF4_2,
+                         d_state.HF4_3, d_state.SPREAD)]
+    used = [n for n in lengths if n]
+    cycles[HF1] += nleaves + 1
+    cycles[HF1INIT] += len(lengths) + 1
+    cycles[HF2] += 16
+    cycles[HF3] += max(used) - min(used) + 2
+    cycles[HF4] += len(lengths) + 1
+    cycles[HF4_2] += len(used)
+    cycles[HF4_3] += len(used)
+    imb = min(imb, max(used))
+    aim = (1 << imb) - 1
+    for (code, n), symbol in huffman(lengths).items():
+        reverse = int(format(code, '0%db' % n)[::-1], 2)
+        if n <= imb and reverse + (1 << n) <= aim:
+            cycles[SPREAD] += (aim - reverse) >> n
+    return imb
+
+
+def decompress(data):
+    """ Inflated zlib stream data and the cycles per d_state """
+
+    cycles = [0] * NSTATES
+    (HEADER, BL, READBL, REPEAT, DISTTREE, INIT3, NEXT, D_NEXT, D_NEXT_2,
+     INFLATE, COPY) = [int(s) for s in (
+         d_state.HEADER, d_state.BL, d_state.READBL, d_state.REPEAT,
+         d_state.DISTTREE, d_state.INIT3, d_state.NEXT, d_state.D_NEXT,
+         d_state.D_NEXT_2, d_state.INFLATE, d_state.COPY)]
+    instant = 10 if core.DYNAMIC else 9
+    r = BitReader(data, 2)
+    out = bytearray()
+    filled = [True]
+
+    def check(state):
+        # A state that waits a cycle for the input window after di moved
+        if r.moved:
+            r.moved = False
+            filled[0] = False
+        if not filled[0]:
+            cycles[state] += 1
+            filled[0] = True
+
+    def symbol(table, imb, state):
+        # A lookup of imb bits in the leaves, each longer code costs a cache
+        # miss, the fixed tree is a ROM without read latency
+        v, n = r.code(table)
+        if state == NEXT and not dynamic:
+            cycles[state] += 2
+        else:
+            cycles[state] += 3 + 2 * max(0, n - imb)
+        return v
+
+    # The first header waits for the input window
+    cycles[HEADER] += 6
+    first = True
+    final = False
+    while not final:
+        if not first:
+            check(HEADER)
+        first = False
+        cycles[HEADER] += 1
+        final = r.get(1)
+        method = r.get(2)
+        dynamic = method == 2
+        if method == 0:
+            r.adv(-r.pos & 7)
+            length = r.get(16)
+            r.get(16)
+            for _ in range(length):
+                check(COPY)
+                out.append(r.get(8))
+                cycles[COPY] += 1
+            check(COPY)
+            cycles[COPY] += 1
+            continue
+        if method == 1:
+            table = huffman([8] * 144 + [9] * 112 + [7] * 24 + [8] * 8)
+            dtable = huffman([5] * 32)
+            imb = 9
+        else:
+            check(BL)
+            nlit = 257 + r.get(5)
+            ndist = 1 + r.get(5)
+            ncl = 4 + r.get(4)
+            cycles[BL] += 1
+            cl = [0] * 19
+            for i in range(19):
+                check(BL)
+                if i < ncl:
+                    cl[CodeLengthOrder[i]] = r.get(3)
+                cycles[BL] += 1
+            check(BL)
+            cycles[BL] += 1
+            clmb = tree_cycles(cycles, cl, NLEAVES, instant)
+            cltable = huffman(cl)
+            lengths = []
+            while len(lengths) < nlit + ndist:
+                check(NEXT)
+                v = symbol(cltable, clmb, NEXT)
+                check(READBL)
+                cycles[READBL] += 1
+                if v < 16:
+                    lengths.append(v)
+                    often = 1
+                elif v == 16:
+                    often = 3 + r.get(2)
+                    lengths += [lengths[-1]] * often
+                elif v == 17:
+                    often = 3 + r.get(3)
+                    lengths += [0] * often
+                else:
+                    often = 11 + r.get(7)
+                    lengths += [0] * often
+                cycles[REPEAT] += often + 1
+            check(READBL)
+            cycles[READBL] += 33
+            cycles[INIT3] += MaxBitLength + 32 - nlit + 1
+            imb = tree_cycles(cycles, lengths[:nlit] + [0] * ndist, NLEAVES,
+                              instant)
+            cycles[DISTTREE] += 1
+            dlengths = lengths[nlit:] + [0] * (32 - ndist)
+            tree_cycles(cycles, dlengths, NDLEAVES, instant)
+            table = huffman(lengths[:nlit])
+            dtable = huffman(lengths[nlit:])
+        while True:
+            check(NEXT)
+            code = symbol(table, imb, NEXT)
+            if method == 1:
+                check(INFLATE)
+            cycles[INFLATE] += 1
+            if code < EndOfBlock:
+                out.append(code)
+                continue
+            if code == EndOfBlock:
+                break
+            token = code - 257
+            if dynamic:
+                # The length and distance bits advance in D_NEXT_2
+                check(D_NEXT)
+            length = CopyLength[token] + r.get(ExtraLengthBits[token])
+            if dynamic:
+                dcode = symbol(dtable, imb, D_NEXT)
+                cycles[D_NEXT_2] += 1
+            else:
+                dcode, n = r.code(dtable)
+            distance = CopyDistance[dcode] + \
+                r.get(ExtraDistanceBits[dcode >> 1])
+            for _ in range(length):
+                out.append(out[-distance])
+            cycles[COPY] += length + 3
+    return bytes(out), cycles
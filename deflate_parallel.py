@@ -0,0 +1,158 @@
+"""
+Host side of speculative parallel decompression with the MyHDL FPGA Deflate
+
+A long stream is split in chunks which are decompressed by several cores at
+the same time:
+
+    The first core decompresses the zlib stream with STARTD as usual and
+    stops with i_stop at the bit address of the next chunk.
+
+    For every other chunk find_header() searches a plausible dynamic block
+    header behind the split point. A core starts there with RAWD. Bytes
+    that depend on the unknown window before its chunk are marked in
+    o_entry.
+
+    When the output of the previous chunk is known resolve() replaces the
+    marks. The result is only right when the previous core stopped at the
+    header that was found. A core only stops at i_stop when a block starts
+    there, else it decodes on to the end of the stream. So resolve() checks
+    the o_iprogress of the previous job and raises Misspeculation when it
+    did not stop, or when the speculative job ended with o_fail because it
+    met invalid data. The output of the previous core then already holds
+    the rest of the stream, it was decoded serially, and the speculative
+    output is dropped.
+
+"""
+
+import deflate
+from deflate import CodeLengthOrder
+
+MaxBits = 15
+
+
+def get_bits(data, pos, n):
+    """ n bits at bit address pos, deflate bit order """
+    v = 0
+    for i in range(n):
+        p = pos + i
+        if p >> 3 >= len(data):
+            raise IndexError("end of data")
+        v |= ((data[p >> 3] >> (p & 7)) & 1) << i
+    return v
+
+
+def make_code(lengths):
+    """ Canonical code of lengths, None when it is not complete """
+    count = [0] * (MaxBits + 1)
+    for n in lengths:
+        count[n] += 1
+    left = 1
+    for n in range(1, MaxBits + 1):
+        left = (left << 1) - count[n]
+        if left < 0:
+            return None
+    if left != 0 and count[0] < len(lengths) - 1:
+        return None
+    symbols = [s for n in range(1, MaxBits + 1)
+               for s, sn in enumerate(lengths) if sn == n]
+    return count, symbols
+
+
+def decode(data, pos, code):
+    """ Decode a symbol at pos, return the symbol and the next pos """
+    count, symbols = code
+    v = first = index = 0
+    for n in range(1, MaxBits + 1):
+        v |= get_bits(data, pos, 1)
+        pos += 1
+        if v - count[n] < first:
+            return symbols[index + v - first], pos
+        index += count[n]
+        first = (first + count[n]) << 1
+        v <<= 1
+    raise ValueError("invalid code")
+
+
+def plausible_header(data, pos):
+    """ True when a dynamic block header starts at pos """
+    try:
+        if get_bits(data, pos + 1, 2) != 2:
+            return False
+        nlen = get_bits(data, pos + 3, 5) + 257
+        ndist = get_bits(data, pos + 8, 5) + 1
+        ncode = get_bits(data, pos + 13, 4) + 4
+        if nlen > 286 or ndist > 30:
+            return False
+        pos += 17
+        lengths = [0] * 19
+        for i in range(ncode):
+            lengths[CodeLengthOrder[i]] = get_bits(data, pos, 3)
+            pos += 3
+        lencode = make_code(lengths)
+        if lencode is None:
+            return False
+        lengths = []
+        while len(lengths) < nlen + ndist:
+            sym, pos = decode(data, pos, lencode)
+            if sym < 16:
+                lengths.append(sym)
+                continue
+            if sym == 16:
+                if not lengths:
+                    return False
+                n, extra, sym = 3, 2, lengths[-1]
+            elif sym == 17:
+                n, extra, sym = 3, 3, 0
+            else:
+                n, extra, sym = 11, 7, 0
+            n += get_bits(data, pos, extra)
+            pos += extra
+            lengths += [sym] * n
+        if len(lengths) != nlen + ndist or lengths[256] == 0:
+            return False
+        return (make_code(lengths[:nlen]) is not None and
+                make_code(lengths[nlen:]) is not None)
+    except (IndexError, ValueError):
+        return False
+
+
+def find_header(data, start, end=None):
+    """ First bit address >= start with a plausible dynamic block header """
+    if end is None:
+        end = 8 * len(data)
+    for pos in range(start, end):
+        if plausible_header(data, pos):
+            return pos
+    return None
+
+
+class Misspeculation(ValueError):
+
+    """ The previous chunk did not end at the header that was found """
+
+
+def resolve(entries, window, obase=0, start=None, end=None, failed=False):
+    """ Bytes of a speculative decode, marks are taken from window
+
+    entries: o_entry values of the chunk, its output started at obase
+    window: output before the chunk, at least the last OBSIZE bytes
+    start: bit address where the chunk was decoded from, None is unchecked
+    end: o_iprogress of the previous job, that had i_stop at start
+    failed: o_fail of the speculative job
+
+    """
+    if failed or start is not None and end != start >> 3:
+        raise Misspeculation("no block starts at bit %s" % start)
+    # The ring of the current configuration
+    size = deflate.OBSIZE
+    mark = 1 << deflate.LOBSIZE
+    out = bytearray()
+    for e in entries:
+        if e & mark:
+            d = (obase - e) & (size - 1) or size
+            if d > len(window):
+                raise ValueError("reference before the stream")
+            out.append(window[-d])
+        else:
+            out.append(e)
+    return bytes(out)
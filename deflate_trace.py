@@ -0,0 +1,78 @@
+"""
+Event trace of the MyHDL FPGA Deflate core in simulation
+
+Pass a Tracer as the tracer argument of deflate(). The core then records
+each event with its cycle, d_state, di and do in a ring of the last size
+events, or in a binary file when path is given. Without a tracer nothing is
+instantiated and the core does not spend a cycle of simulation on tracing.
+
+Events have a level and a category, the tracer keeps the events up to its
+level in the selected categories:
+
+1: START, END, HEADER, TREE, EOB, CHECKPOINT (job)
+2: CACHE_MISS, DCACHE_MISS (cache)
+3: HOLDB, INPUT (stall), STATE (state, the state that was entered)
+
+"""
+
+import struct
+from collections import deque, namedtuple
+
+from deflate import t_event, d_state
+
+LEVEL = dict(START=1, END=1, HEADER=1, TREE=1, EOB=1, CHECKPOINT=1,
+             CACHE_MISS=2, DCACHE_MISS=2,
+             HOLDB=3, INPUT=3, STATE=3)
+
+CATEGORY = dict(START='job', END='job', HEADER='job', TREE='job',
+                EOB='job', CHECKPOINT='job',
+                CACHE_MISS='cache', DCACHE_MISS='cache',
+                HOLDB='stall', INPUT='stall', STATE='state')
+
+# cycle, event, d_state, di, do
+RECORD = struct.Struct('<IBBII')
+
+Event = namedtuple('Event', 'cycle event state di do')
+
+
+class Tracer:
+
+    """ Keep the events up to level in categories (None is all) """
+
+    def __init__(self, level=1, categories=None, size=4096, path=None):
+        self.wants = [False] * len(t_event._names)
+        for name in t_event._names[1:]:
+            self.wants[int(getattr(t_event, name))] = \
+                LEVEL[name] <= level and \
+                (categories is None or CATEGORY[name] in categories)
+        self.ring = deque(maxlen=size)
+        self.file = None
+        if path is not None:
+            self.file = open(path, 'wb')
+
+    def record(self, cycle, event, state, di, do):
+        if self.wants[event]:
+            if self.file:
+                self.file.write(RECORD.pack(cycle, event, state, di, do))
+            else:
+                self.ring.append((cycle, event, state, di, do))
+
+    def events(self):
+        """ The events in the ring """
+        return [decode(r) for r in self.ring]
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def decode(r):
+    cycle, event, state, di, do = r
+    return Event(cycle, t_event._names[event], d_state._names[state], di, do)
+
+
+def read_trace(path):
+    """ The events of a binary trace file """
+    with open(path, 'rb') as f:
+        return [decode(r) for r in RECORD.iter_unpack(f.read())]
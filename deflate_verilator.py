@@ -0,0 +1,155 @@
+"""
+Verilator model of the MyHDL FPGA Deflate core for the testbenches
+
+deflate() takes the ports of deflate.deflate(). It converts the core with
+the ports that are connected and the flags of the deflate module at the time
+of the call, builds it with Verilator into a shared library with a small C
+wrapper and steps the model on each rising edge of clk through ctypes. The
+testbench sees the same ports as with the MyHDL core.
+
+Builds are kept in BUILD by the hash of the Verilog, so a configuration is
+only compiled once. Tested with Verilator 5.048, needs a C++ compiler.
+
+"""
+
+import ctypes
+import hashlib
+import inspect
+import os
+import re
+import subprocess
+
+from myhdl import always, block, Signal, ResetSignal
+
+import deflate as core
+
+BUILD = "obj_verilator"
+
+PORT = re.compile(r"^(input|output)\s+(?:signed\s+)?(?:\[(\d+):0\]\s+)?(\w+);",
+                  re.M)
+DATE = re.compile(r"^// Date:.*$", re.M)
+
+_libs = {}
+
+
+def ports_of(verilog):
+    """ (direction, width, name) of each port of a module """
+    return [(d, int(msb or 0) + 1, name)
+            for d, msb, name in PORT.findall(verilog)]
+
+
+def wrapper(ports):
+    """ C++ access to the ports of Vdeflate """
+    c = ['#include <cstdint>', '#include "Vdeflate.h"', 'extern "C" {',
+         'void *dv_new() { return new Vdeflate; }',
+         'void dv_eval(void *p) { ((Vdeflate *)p)->eval(); }']
+    for d, width, name in ports:
+        if width > 64:
+            raise ValueError("port %s is wider than 64 bits" % name)
+        if d == 'input':
+            c.append('void dv_set_%s(void *p, uint64_t v) '
+                     '{ ((Vdeflate *)p)->%s = v; }' % (name, name))
+        else:
+            c.append('uint64_t dv_get_%s(void *p) '
+                     '{ return ((Vdeflate *)p)->%s; }' % (name, name))
+    c.append('}')
+    return '\n'.join(c) + '\n'
+
+
+def build(verilog):
+    """ The library of the model of verilog, built when not there yet """
+
+    # The date of the conversion does not change the model
+    key = DATE.sub("", verilog)
+    path = os.path.join(BUILD, hashlib.sha1(key.encode()).hexdigest())
+    lib = os.path.join(path, "libdeflate.so")
+    if lib in _libs:
+        return _libs[lib]
+    if not os.path.exists(lib):
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "deflate.v"), 'w') as f:
+            f.write(verilog)
+        with open(os.path.join(path, "wrapper.cpp"), 'w') as f:
+            f.write(wrapper(ports_of(verilog)))
+        # MyHDL writes Verilog 2005, with names like do that are
+        # SystemVerilog keywords
+        subprocess.run(["verilator", "--cc", "deflate.v",
+                        "--default-language", "1364-2005",
+                        "--top-module", "deflate", "-Wno-fatal", "-O3",
+                        "--build", "-CFLAGS", "-fPIC -O2", "-Mdir", "."],
+                       cwd=path, check=True)
+        root = subprocess.run(["verilator", "--getenv", "VERILATOR_ROOT"],
+                              check=True, stdout=subprocess.PIPE,
+                              universal_newlines=True).stdout.strip()
+        subprocess.run(["g++", "-shared", "-fPIC", "-O2", "-I.",
+                        "-I" + os.path.join(root, "include"),
+                        "-I" + os.path.join(root, "include", "vltstd"),
+                        "wrapper.cpp", "libVdeflate.a", "libverilated.a",
+                        "-pthread", "-o", "libdeflate.so"],
+                       cwd=path, check=True)
+    _libs[lib] = ctypes.CDLL(os.path.abspath(lib))
+    return _libs[lib]
+
+
+def clone(sig):
+    """ A signal of the same type for the conversion """
+    if isinstance(sig, ResetSignal):
+        return ResetSignal(sig.val, sig.active, sig.isasync)
+    return Signal(sig.val)
+
+
+def deflate(*args, **kwargs):
+    """ Verilator model with the ports of deflate.deflate() """
+
+    bound = inspect.signature(core.deflate.func).bind(*args, **kwargs)
+    if bound.arguments.get('tracer') is not None:
+        raise ValueError("The Verilator model has no tracer")
+    sigs = {name: s for name, s in bound.arguments.items() if s is not None}
+
+    path = os.path.join(BUILD, "convert")
+    os.makedirs(path, exist_ok=True)
+    core.deflate(**{name: clone(s) for name, s in sigs.items()}).convert(
+        path=path, testbench=False, initial_values=False)
+    with open(os.path.join(path, "deflate.v")) as f:
+        verilog = f.read()
+    return verilated(build(verilog), ports_of(verilog), sigs)
+
+
+@block
+def verilated(lib, ports, sigs):
+
+    """ Step the model in lib on each rising edge of sigs['clk'] """
+
+    lib.dv_new.restype = ctypes.c_void_p
+    model = ctypes.c_void_p(lib.dv_new())
+    inputs = []
+    outputs = []
+    for d, width, name in ports:
+        if d == 'input':
+            f = getattr(lib, 'dv_set_' + name)
+            f.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+            f.restype = None
+            if name != 'clk':
+                inputs.append((f, sigs[name]))
+        else:
+            f = getattr(lib, 'dv_get_' + name)
+            f.argtypes = [ctypes.c_void_p]
+            f.restype = ctypes.c_uint64
+            outputs.append((f, sigs[name], width == 1))
+    set_clk = lib.dv_set_clk
+    evaluate = lib.dv_eval
+    evaluate.argtypes = [ctypes.c_void_p]
+
+    @always(sigs['clk'].posedge)
+    def step():
+        for f, s in inputs:
+            f(model, int(s))
+        set_clk(model, 1)
+        evaluate(model)
+        set_clk(model, 0)
+        evaluate(model)
+        for f, s, bit in outputs:
+            v = f(model)
+            s.next = bool(v) if bit else v
+
+    return step
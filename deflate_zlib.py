@@ -0,0 +1,414 @@
+"""
+zlib compatible API on the MyHDL FPGA Deflate core
+
+compress(), decompress(), compressobj() and decompressobj() behave like
+those of zlib for zlib streams (wbits 9 to 15), but each stream is a job of
+a deflate core in simulation. CORE is the core, deflate.deflate or a
+backend with its ports like deflate_verilator.deflate. Each job is appended
+to jobs as a deflate_driver.Job with its cycles, to estimate the throughput
+of an application from its real calls:
+
+    import deflate_zlib as zlib
+
+The objects stream: each compress() or decompress() call writes its input
+into a running job of the core and returns the output the core has made
+when it waits for more input. The simulation of the job is suspended
+between calls. MyHDL runs one simulation at a time, so while a stream has
+a job running no other job can start: a compress object runs one from
+MINSIZE bytes of input up to its next flush, a decompress object up to the
+end of its stream.
+
+The core has a single compression level and writes fixed Huffman blocks,
+level 0 gives stored blocks from software. Z_HUFFMAN_ONLY and Z_RLE are
+rejected. A compress job runs with i_cpoint past its input, its blocks are
+not final and an empty final block ends them. A Z_SYNC_FLUSH or
+Z_FULL_FLUSH ends the job and puts an empty stored block there instead, so
+the output inflates up to there. Matches do not reach back across a flush. Input
+shorter than MINSIZE bytes up to a flush, which the core does not compress,
+gives a stored block from software and no job.
+
+A decompress object finds the end of the stream with the core, o_iprogress
+of the job is the byte where the checksum starts. Without XHISTORY the
+distances of the stream must fit in OBSIZE, whatever the window in its
+header, else the checksum fails.
+
+"""
+
+import zlib
+from zlib import error, adler32, MAX_WBITS, DEFLATED, \
+    DEF_MEM_LEVEL, Z_DEFAULT_STRATEGY, Z_HUFFMAN_ONLY, Z_RLE, Z_NO_FLUSH, \
+    Z_SYNC_FLUSH, Z_FULL_FLUSH, Z_FINISH
+
+from myhdl import always, delay, instance, Error, Signal, ResetSignal, \
+    intbv, modbv, Simulation, StopSimulation
+
+import deflate
+from deflate import STARTC, STARTD, LMAX
+from deflate_driver import DeflateDriver, Feed, MINSIZE
+
+CORE = deflate.deflate
+
+jobs = []
+
+HEADER = b'\x78\x9c'  # zlib header of the core
+SYNC = b'\x00\x00\xff\xff'  # LEN and NLEN of an empty stored block
+STEP = 64  # Cycles simulated between checks of a streamed job
+HOLD = 8  # Last output bytes of a compress job that its end rewrites
+
+_running = None  # The streamed job that holds the simulator
+
+
+def signals():
+    """ The ports of the core that a DeflateDriver drives """
+    return dict(i_mode=Signal(intbv(0)[4:]),
+                o_done=Signal(bool(0)),
+                i_data=Signal(intbv()[8:]),
+                o_iprogress=Signal(modbv()[LMAX:]),
+                o_oprogress=Signal(modbv()[LMAX:]),
+                o_byte=Signal(intbv()[8:]),
+                i_waddr=Signal(modbv()[LMAX:]),
+                i_raddr=Signal(modbv()[LMAX:]),
+                i_we=Signal(bool(0)), i_re=Signal(bool(0)))
+
+
+def check_idle():
+    if _running is not None:
+        raise error("a stream still runs a job on the core, MyHDL runs "
+                    "one simulation at a time")
+
+
+def run(mode, data, cpoint=False):
+    """ The output of a job of mode on data, with cpoint the compressor ends
+    with a checkpoint """
+
+    check_idle()
+    clk = Signal(bool(0))
+    reset = ResetSignal(1, 1, True)
+    sig = signals()
+    # No checkpoint before the end of the input
+    i_cpoint = Signal(intbv((1 << LMAX) - 1 if cpoint else 0)[LMAX:])
+    dut = CORE(clk=clk, reset=reset, i_cpoint=i_cpoint, **sig)
+    driver = DeflateDriver(clk, **sig)
+    result = []
+
+    @always(delay(5))
+    def clkgen():
+        clk.next = not clk
+
+    @instance
+    def host():
+        yield clk.negedge
+        reset.next = 0
+        result.append((yield from driver.job(mode, data)))
+        raise StopSimulation()
+
+    Simulation(dut, clkgen, host).run(quiet=1)
+    jobs.extend(driver.jobs)
+    return result[0]
+
+
+class Stream:
+
+    """ A job of mode that runs while its input arrives in feed. Its
+    simulation is suspended between calls and holds the simulator until
+    the job ends. """
+
+    def __init__(self, mode):
+        global _running
+        self.sim = None
+        check_idle()
+        clk = Signal(bool(0))
+        reset = ResetSignal(1, 1, True)
+        sig = signals()
+        o_wait = Signal(bool(0))
+        # A flush is not known when the job starts, so no block is final and
+        # an empty final block ends the stream, as after a checkpoint
+        i_cpoint = Signal(intbv((1 << LMAX) - 1 if mode == STARTC else 0)
+                          [LMAX:])
+        dut = CORE(clk=clk, reset=reset, i_cpoint=i_cpoint,
+                   o_wait=o_wait, **sig)
+        self.driver = DeflateDriver(clk, o_wait=o_wait, **sig)
+        self.feed = Feed()
+
+        @always(delay(5))
+        def clkgen():
+            clk.next = not clk
+
+        @instance
+        def host():
+            yield clk.negedge
+            reset.next = 0
+            yield from self.driver.stream(mode, self.feed)
+            raise StopSimulation()
+
+        self.sim = Simulation(dut, clkgen, host)
+        _running = self
+
+    @property
+    def running(self):
+        return self.sim is not None
+
+    def run(self, until=None):
+        """ Simulate the job until until(feed), the job waits for input or
+        it ends """
+        feed = self.feed
+        feed.starved = False
+        while self.sim is not None and not feed.starved and \
+                not (until and until(feed)):
+            try:
+                if not self.sim.run(10 * STEP, quiet=1):
+                    self.close()
+                    jobs.extend(self.driver.jobs)
+            except Error as e:
+                self.close()
+                raise error("Error -3 while running the core: %s" % e)
+
+    def end(self):
+        """ Run the job to its end after the last input byte """
+        self.feed.end = True
+        self.run()
+
+    def close(self):
+        """ Stop the simulation and give the simulator free """
+        global _running
+        if self.sim is not None:
+            self.sim.quit()
+            self.sim = None
+        if _running is self:
+            _running = None
+
+    def __del__(self):
+        self.close()
+
+
+def stored(data, final=True):
+    """ Stored blocks of data, the last one final if final """
+    out = b''
+    while True:
+        n = min(len(data), 0xFFFF)
+        last = n == len(data)
+        out += bytes([final and last]) + n.to_bytes(2, 'little') + \
+            (n ^ 0xFFFF).to_bytes(2, 'little') + bytes(data[:n])
+        data = data[n:]
+        if last:
+            return out
+
+
+def synced(blocks):
+    """ The blocks of a compress job up to an empty stored block, byte
+    aligned, instead of the empty final block """
+    # With i_cpoint the core ends the stream with an empty final fixed
+    # block, bits 1 1 0 and a 7 bit end of block code. Its first bit is the
+    # one before the last bit set, the empty stored block goes there.
+    bits = int.from_bytes(blocks, 'little')
+    n = bits.bit_length() - 2
+    bits &= (1 << n) - 1
+    return bits.to_bytes((n + 3 + 7) // 8, 'little') + SYNC
+
+
+def check_wbits(wbits):
+    if not 9 <= wbits <= MAX_WBITS:
+        raise ValueError("only zlib streams (wbits 9 to 15) are supported")
+
+
+def compress(data, level=-1, wbits=MAX_WBITS):
+    """ The zlib stream of data """
+    c = compressobj(level, wbits=wbits)
+    return c.compress(data) + c.flush()
+
+
+def decompress(data, wbits=MAX_WBITS, bufsize=zlib.DEF_BUF_SIZE):
+    """ The inflated zlib stream data """
+    d = decompressobj(wbits)
+    out = d.decompress(data)
+    out += d.flush()
+    if not d.eof:
+        raise error("Error -5 while decompressing data: incomplete or "
+                    "truncated stream")
+    return out
+
+
+class Compress:
+
+    """ Compress object of compressobj(), other flush modes than Z_NO_FLUSH
+    and Z_FINISH flush like Z_FULL_FLUSH """
+
+    def __init__(self, level):
+        self.store = level == 0
+        self.data = bytearray()  # Input of a job that has not started
+        self.job = None
+        self.sent = 0  # Output bytes of the job returned so far
+        self.adler = adler32(b'')
+        self.header = HEADER
+        self.finished = False
+
+    def start(self):
+        """ Start a job on the input so far, the first job of the stream
+        writes the zlib header """
+        self.job = Stream(STARTC)
+        self.job.feed.data += self.data
+        self.data = bytearray()
+        self.sent = 0 if self.header else len(HEADER)
+        self.header = b''
+
+    def output(self):
+        """ Output of the job that its end does not change """
+        out = self.job.feed.out
+        end = max(self.sent, len(out) - HOLD)
+        data = bytes(out[self.sent:end])
+        self.sent = end
+        return data
+
+    def compress(self, data):
+        if self.finished:
+            raise error("compress object already flushed")
+        self.adler = adler32(data, self.adler)
+        if self.store:
+            header, self.header = self.header, b''
+            return header + (stored(data, False) if data else b'')
+        if self.job is None:
+            self.data += data
+            if len(self.data) < MINSIZE:
+                return b''
+            self.start()
+        else:
+            self.job.feed.data += data
+        self.job.run()
+        return self.output()
+
+    def flush(self, mode=Z_FINISH):
+        if mode == Z_NO_FLUSH:
+            return b''
+        if self.finished:
+            raise error("compress object already flushed")
+        out, self.header = self.header, b''
+        if self.job is not None:
+            self.job.end()
+            # The blocks without the zlib trailer of the job
+            blocks = bytes(self.job.feed.out[self.sent:-4])
+            self.job = None
+            out += blocks if mode == Z_FINISH else synced(blocks)
+        elif mode == Z_FINISH:
+            out += stored(self.data)
+        else:
+            if self.data:
+                out += stored(self.data, False)
+            out += b'\x00' + SYNC
+        self.data = bytearray()
+        if mode == Z_FINISH:
+            self.finished = True
+            out += self.adler.to_bytes(4, 'big')
+        return out
+
+
+class Decompress:
+
+    """ Decompress object of decompressobj() """
+
+    def __init__(self):
+        self.job = None
+        self.header = b''  # Input until the zlib header is complete
+        self.feed = None  # Input and output of the stream
+        self.sent = 0  # Output bytes returned so far
+        self.eof = False
+        self.unused_data = b''
+        self.unconsumed_tail = b''
+
+    def start(self, data):
+        """ The job of the stream, once its header is there """
+        self.header += data
+        if len(self.header) < 2:
+            return
+        cmf, flg = self.header[:2]
+        if cmf & 0x0F != DEFLATED or (cmf << 8 | flg) % 31:
+            raise error("Error -3 while decompressing data: incorrect "
+                        "header check")
+        if flg & 0x20:
+            raise error("Error -3 while decompressing data: the core has "
+                        "no preset dictionary")
+        self.job = Stream(STARTD)
+        self.feed = self.job.feed
+        self.feed.data += self.header
+
+    def check(self):
+        """ Set eof when the stream and its checksum are complete and the
+        output is returned """
+        feed = self.feed
+        if feed is None or feed.iend is None or \
+                len(feed.data) < feed.iend + 4:
+            return
+        if feed.data[feed.iend:feed.iend + 4] != \
+                adler32(feed.out).to_bytes(4, 'big'):
+            raise error("Error -3 while decompressing data: incorrect data "
+                        "check")
+        if self.sent == len(feed.out):
+            self.eof = True
+            self.unused_data = bytes(feed.data[feed.iend + 4:])
+
+    def output(self, max_length=0):
+        out = self.feed.out
+        end = len(out)
+        if max_length:
+            end = min(end, self.sent + max_length)
+        data = bytes(out[self.sent:end])
+        self.sent = end
+        return data
+
+    def decompress(self, data, max_length=0):
+        if max_length < 0:
+            raise ValueError("max_length must be non-negative")
+        if self.eof:
+            self.unused_data += data
+            return b''
+        if self.feed is None:
+            self.start(data)
+            if self.feed is None:
+                return b''
+        else:
+            self.feed.data += data
+        self.unconsumed_tail = b''
+        if self.job.running:
+            self.job.run(lambda feed: max_length and
+                         len(feed.out) - self.sent >= max_length)
+            feed = self.feed
+            if self.job.running and feed.written < len(feed.data):
+                # Output is at max_length, the core has not seen the rest
+                self.unconsumed_tail = bytes(feed.data[feed.written:])
+                del feed.data[feed.written:]
+        out = self.output(max_length)
+        self.check()
+        return out
+
+    def flush(self, length=zlib.DEF_BUF_SIZE):
+        if self.feed is None or self.eof:
+            return b''
+        if self.job.running:
+            self.job.run()
+            # A truncated stream, decompress() cannot follow a flush()
+            self.job.close()
+        out = self.output()
+        self.check()
+        return out
+
+
+def compressobj(level=-1, method=DEFLATED, wbits=MAX_WBITS,
+                memLevel=DEF_MEM_LEVEL, strategy=Z_DEFAULT_STRATEGY,
+                zdict=None):
+    """ A compress object, level 0 stores and the other levels use the
+    core """
+    check_wbits(wbits)
+    if not -1 <= level <= 9:
+        raise error("Bad compression level")
+    if strategy in (Z_HUFFMAN_ONLY, Z_RLE):
+        raise ValueError("the core has no Huffman only or RLE strategy")
+    if zdict is not None:
+        raise ValueError("the core has no preset dictionary")
+    return Compress(level)
+
+
+def decompressobj(wbits=MAX_WBITS, zdict=b''):
+    """ A decompress object """
+    check_wbits(wbits)
+    if zdict:
+        raise ValueError("the core has no preset dictionary")
+    return Decompress()